@@ -49,6 +49,7 @@ from core.utils import (
     validate_data_subject_match,
     print_progress,
     strip_html,
+    json_loads,
 )
 from core.activity_log import log_event
 
@@ -80,18 +81,15 @@ def load_slack_export(zip_path: str) -> Dict[str, Any]:
 
         # Load users.json
         if 'users.json' in file_list:
-            content = zf.read('users.json').decode('utf-8')
-            data['users'] = json.loads(content)
+            data['users'] = json_loads(zf.read('users.json'))
 
         # Load channels.json
         if 'channels.json' in file_list:
-            content = zf.read('channels.json').decode('utf-8')
-            data['channels'] = json.loads(content)
+            data['channels'] = json_loads(zf.read('channels.json'))
 
         # Load integration_logs.json if present
         if 'integration_logs.json' in file_list:
-            content = zf.read('integration_logs.json').decode('utf-8')
-            data['integration_logs'] = json.loads(content)
+            data['integration_logs'] = json_loads(zf.read('integration_logs.json'))
 
         # Load messages from channel directories
         message_files = [
@@ -103,8 +101,7 @@ def load_slack_export(zip_path: str) -> Dict[str, Any]:
 
         for msg_file in message_files:
             try:
-                content = zf.read(msg_file).decode('utf-8')
-                messages = json.loads(content)
+                messages = json_loads(zf.read(msg_file))
 
                 # Extract channel name from path
                 channel_dir = msg_file.split('/')[0]
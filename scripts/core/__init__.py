@@ -9,15 +9,26 @@ from .docgen import create_vendor_report, create_cover_letter, create_redaction_
 from .utils import (
     setup_argparser,
     parse_extra_redactions,
+    parse_output_formats,
+    OUTPUT_FORMATS,
+    json_loads,
     load_json,
+    load_json_collections,
     load_csv,
+    detect_csv_encoding,
+    iter_csv_rows,
     extract_zip,
     save_json,
+    run_concurrently,
     ensure_output_dir,
     safe_filename,
     format_date,
+    extract_fields,
+    join_fields,
+    id_lookup_keys,
     truncate,
     strip_html,
+    find_name_matches,
 )
 from .activity_log import (
     log_event,
@@ -34,15 +45,26 @@ __all__ = [
     'create_redaction_key',
     'setup_argparser',
     'parse_extra_redactions',
+    'parse_output_formats',
+    'OUTPUT_FORMATS',
+    'json_loads',
     'load_json',
+    'load_json_collections',
     'load_csv',
+    'detect_csv_encoding',
+    'iter_csv_rows',
     'extract_zip',
     'save_json',
+    'run_concurrently',
     'ensure_output_dir',
     'safe_filename',
     'format_date',
+    'extract_fields',
+    'join_fields',
+    'id_lookup_keys',
     'truncate',
     'strip_html',
+    'find_name_matches',
     'log_event',
     'read_activity_log',
     'get_activity_summary',
@@ -23,7 +23,18 @@ GDPR Article 15(4) Compliance:
 """
 
 import re
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional speedup
+    ahocorasick = None
+
+# Patterns shorter than this are never replaced (too many false matches)
+MIN_PATTERN_LENGTH = 3
+
+# Joins a batch of texts so the automaton can scan them in one pass
+BATCH_SEPARATOR = '\x1e'
 
 
 class RedactionEngine:
@@ -66,6 +77,13 @@ class RedactionEngine:
             'id': 0,
         }
 
+        # Compiled matcher state, rebuilt lazily after the map changes
+        self._compiled = False
+        self._patterns: List[str] = []
+        self._automaton = None
+        self._regex: Optional[re.Pattern] = None
+        self._regex_labels: Dict[str, str] = {}
+
     def is_data_subject(
         self,
         name: str = None,
@@ -114,12 +132,18 @@ class RedactionEngine:
 
         return False
 
+    def _map_identifier(self, identifier: str, label: str) -> None:
+        """Map an identifier to a label and invalidate the compiled matcher."""
+        self.redaction_map[identifier] = label
+        self._compiled = False
+
     def add_user(
         self,
         user_id: str,
         name: str = None,
         email: str = None,
-        is_bot: bool = False
+        is_bot: bool = False,
+        aliases: Iterable[str] = None
     ) -> Optional[str]:
         """
         Add a user to the redaction map.
@@ -133,6 +157,8 @@ class RedactionEngine:
             name: User's display name
             email: User's email address
             is_bot: Whether this is a bot/automated user
+            aliases: Additional identifiers for the same user (e.g., a login
+                alongside a numeric ID), mapped to the same label
 
         Returns:
             The redaction label (e.g., "[REDACTED_USER_1]") or None if data subject
@@ -141,8 +167,10 @@ class RedactionEngine:
         if self.is_data_subject(name, email, user_id):
             return None
 
+        identifiers = [user_id, name, email, *(aliases or ())]
+
         # Check if any identifier is already mapped
-        for identifier in [user_id, name, email]:
+        for identifier in identifiers:
             if identifier and identifier in self.redaction_map:
                 return self.redaction_map[identifier]
 
@@ -152,9 +180,9 @@ class RedactionEngine:
         label = f"[REDACTED_{category.upper()}_{self.counters[category]}]"
 
         # Map all identifiers to the same label
-        for identifier in [user_id, name, email]:
+        for identifier in identifiers:
             if identifier:
-                self.redaction_map[identifier] = label
+                self._map_identifier(identifier, label)
 
                 # Also map first and last name parts for in-text matching
                 if identifier == name and name:
@@ -162,14 +190,28 @@ class RedactionEngine:
                     if len(parts) >= 2:
                         # Only map if parts are long enough to avoid false matches
                         if len(parts[0]) >= 3:
-                            self.redaction_map[parts[0]] = label
+                            self._map_identifier(parts[0], label)
                         if len(parts[-1]) >= 3:
-                            self.redaction_map[parts[-1]] = label
+                            self._map_identifier(parts[-1], label)
 
         # Store reverse mapping for audit
         self.reverse_map[label] = f"{name or 'Unknown'} ({email or user_id})"
         return label
 
+    def add_users_bulk(self, users: Iterable[tuple]) -> None:
+        """
+        Add many users to the redaction map from an iterable.
+
+        Consumes the iterable lazily, so vendor processors can pass a
+        generator straight from extract_users without building a dict.
+
+        Args:
+            users: Iterable of (user_id, name, email) or
+                (user_id, name, email, aliases) tuples
+        """
+        for user_id, name, email, *aliases in users:
+            self.add_user(user_id, name, email, aliases=aliases[0] if aliases else None)
+
     def add_external(self, name: str) -> str:
         """
         Add an external name (not in the vendor's user list) to redaction map.
@@ -196,16 +238,16 @@ class RedactionEngine:
 
         self.counters['external'] += 1
         label = f"[REDACTED_EXTERNAL_{self.counters['external']}]"
-        self.redaction_map[name] = label
+        self._map_identifier(name, label)
         self.reverse_map[label] = name
 
         # Also map name parts
         parts = name.split()
         if len(parts) >= 2:
             if len(parts[0]) >= 3:
-                self.redaction_map[parts[0]] = label
+                self._map_identifier(parts[0], label)
             if len(parts[-1]) >= 3:
-                self.redaction_map[parts[-1]] = label
+                self._map_identifier(parts[-1], label)
 
         return label
 
@@ -232,7 +274,7 @@ class RedactionEngine:
 
         self.counters['email'] += 1
         label = f"[REDACTED_EMAIL_{self.counters['email']}]"
-        self.redaction_map[email] = label
+        self._map_identifier(email, label)
         self.reverse_map[label] = email
         return label
 
@@ -260,10 +302,45 @@ class RedactionEngine:
 
         self.counters['phone'] += 1
         label = f"[REDACTED_PHONE_{self.counters['phone']}]"
-        self.redaction_map[phone] = label
+        self._map_identifier(phone, label)
         self.reverse_map[label] = phone
         return label
 
+    def compile(self) -> None:
+        """
+        Build the matcher used by redact() from the current redaction map.
+
+        redact() calls this automatically whenever the map has changed, so
+        calling it explicitly only moves the build cost up front. When
+        pyahocorasick is installed an Aho-Corasick automaton is built so
+        each text is scanned once regardless of how many patterns exist;
+        otherwise a single case-insensitive regex alternation is used.
+        """
+        # Sort patterns by length (descending) to match longer patterns first
+        self._patterns = sorted(
+            (p for p in self.redaction_map if len(p) >= MIN_PATTERN_LENGTH),
+            key=len,
+            reverse=True
+        )
+
+        # The regex is only needed without an automaton (or for the rare text
+        # the automaton can't handle), so it is built on first use
+        self._regex = None
+        self._regex_labels = {}
+
+        self._automaton = None
+        if ahocorasick is not None and self._patterns:
+            automaton = ahocorasick.Automaton()
+            for pattern in self._patterns:
+                key = pattern.lower()
+                # First pattern wins when two differ only by case
+                if key not in automaton:
+                    automaton.add_word(key, (len(key), self.redaction_map[pattern]))
+            automaton.make_automaton()
+            self._automaton = automaton
+
+        self._compiled = True
+
     def redact(self, text: str) -> str:
         """
         Apply all redactions to a text string.
@@ -280,32 +357,103 @@ class RedactionEngine:
         if not text:
             return text
 
-        # Sort patterns by length (descending) to match longer patterns first
-        sorted_patterns = sorted(
-            self.redaction_map.keys(),
-            key=len,
-            reverse=True
-        )
+        if not self._compiled:
+            self.compile()
 
         result = str(text)
-        for pattern in sorted_patterns:
-            # Skip very short patterns to avoid false matches
-            if len(pattern) < 3:
-                continue
-
-            # Case-insensitive replacement
-            try:
-                result = re.sub(
-                    re.escape(pattern),
-                    self.redaction_map[pattern],
-                    result,
-                    flags=re.IGNORECASE
-                )
-            except re.error:
-                # Skip invalid patterns
-                continue
-
-        return result
+        if self._automaton is not None:
+            lowered = result.lower()
+            # Match offsets are only valid if lowercasing kept the length
+            if len(lowered) == len(result):
+                return self._redact_automaton(result, lowered)
+
+        return self._redact_regex(result)
+
+    def redact_many(self, texts: Iterable[str]) -> List[str]:
+        """
+        Redact a batch of texts, returning results in the same order.
+
+        The batch is redacted in-process with a single automaton scan over
+        the joined texts.
+
+        Args:
+            texts: Texts to redact
+
+        Returns:
+            List of redacted texts
+        """
+        texts = list(texts)
+        if not self._compiled:
+            self.compile()
+        return self._redact_batch(texts)
+
+    def _redact_batch(self, texts: List[str]) -> List[str]:
+        """Redact texts in-process, scanning them together when possible."""
+        if (
+            self._automaton is None
+            or len(texts) < 2
+            or not all(isinstance(text, str) for text in texts)
+        ):
+            return [self.redact(text) for text in texts]
+
+        joined = BATCH_SEPARATOR.join(texts)
+        lowered = joined.lower()
+        # The separator must split the result exactly as it split the input,
+        # and match offsets are only valid if lowercasing kept the length
+        if (
+            len(lowered) != len(joined)
+            or joined.count(BATCH_SEPARATOR) != len(texts) - 1
+            or any(BATCH_SEPARATOR in pattern for pattern in self._patterns)
+        ):
+            return [self.redact(text) for text in texts]
+
+        return self._redact_automaton(joined, lowered).split(BATCH_SEPARATOR)
+
+    def _redact_automaton(self, text: str, lowered: str) -> str:
+        """Single-pass leftmost-longest replacement using the automaton."""
+        parts = []
+        pos = 0
+        for end, (length, label) in self._automaton.iter_long(lowered):
+            start = end - length + 1
+            parts.append(text[pos:start])
+            parts.append(label)
+            pos = end + 1
+        if not parts:
+            return text
+        parts.append(text[pos:])
+        return ''.join(parts)
+
+    def _redact_regex(self, text: str) -> str:
+        """Single-pass leftmost-longest replacement using one regex alternation."""
+        if not self._patterns:
+            return text
+
+        if self._regex is None:
+            # Alternatives are tried in order, so longest-first ordering makes
+            # each match the longest pattern starting at that position
+            self._regex = re.compile(
+                '|'.join(map(re.escape, self._patterns)),
+                flags=re.IGNORECASE
+            )
+            for pattern in self._patterns:
+                # First pattern wins when two differ only by case
+                self._regex_labels.setdefault(pattern.lower(), self.redaction_map[pattern])
+
+        return self._regex.sub(self._regex_label, text)
+
+    def _regex_label(self, match: re.Match) -> str:
+        """Return the label for a regex match, whatever its case."""
+        matched = match.group(0)
+        label = self._regex_labels.get(matched.lower())
+        if label is not None:
+            return label
+
+        # IGNORECASE also folds a few characters that lower() leaves alone
+        # (e.g. the long s), so find the pattern that matched directly
+        for pattern in self._patterns:
+            if re.fullmatch(re.escape(pattern), matched, flags=re.IGNORECASE):
+                return self.redaction_map[pattern]
+        return matched
 
     def get_redaction_key(self) -> Dict[str, str]:
         """
@@ -15,19 +15,60 @@ import zipfile
 import csv
 import re
 import html
+import math
 import argparse
+import codecs
 import chardet
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Union
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# save_json output options matching json.dump(indent=2, default=str):
+# datetimes and dataclasses go through default=str as they do in the
+# stdlib encoder, and non-string keys are stringified
+if orjson is not None:
+    ORJSON_SAVE_OPTIONS = (
+        orjson.OPT_INDENT_2
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+# orjson reads integers wider than 64 bits as floats, silently changing long
+# ids; any run of 19+ digits might be one, so such documents go to the stdlib
+_WIDE_NUMBER_RE = re.compile(rb'[0-9]{19}')
+_WIDE_NUMBER_STR_RE = re.compile(r'[0-9]{19}')
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional speedup
+    ijson = None
+
+try:
+    from rapidfuzz import fuzz as rf_fuzz, process as rf_process
+except ImportError:  # pragma: no cover - optional speedup
+    rf_fuzz = rf_process = None
+
 
-def setup_argparser(vendor_name: str) -> argparse.ArgumentParser:
+# Report formats a processor can write; the redaction key is always written
+OUTPUT_FORMATS = frozenset({'docx', 'json'})
+
+
+def setup_argparser(vendor_name: str, with_formats: bool = False) -> argparse.ArgumentParser:
     """
     Create a standard argument parser for DSAR scripts.
 
     Args:
         vendor_name: Name of the vendor (used in help text)
+        with_formats: Add a --format option, for processors whose process()
+            accepts a formats argument
 
     Returns:
         Configured ArgumentParser instance
@@ -63,6 +104,12 @@ Examples:
         default='./output',
         help='Output directory (default: ./output)'
     )
+    if with_formats:
+        parser.add_argument(
+            '--format', '-f',
+            default=','.join(sorted(OUTPUT_FORMATS)),
+            help='Report formats to write, comma-separated (default: docx,json)'
+        )
     return parser
 
 
@@ -81,6 +128,59 @@ def parse_extra_redactions(redact_arg: str) -> List[str]:
     return [name.strip() for name in redact_arg.split(',') if name.strip()]
 
 
+def parse_output_formats(format_arg: str) -> frozenset:
+    """
+    Parse a comma-separated list of report formats from a CLI argument.
+
+    Args:
+        format_arg: Comma-separated formats, e.g. "json" or "docx,json"
+
+    Returns:
+        Frozenset of requested formats (all formats if format_arg is empty)
+
+    Raises:
+        ValueError: If a format is not in OUTPUT_FORMATS
+    """
+    if not format_arg:
+        return OUTPUT_FORMATS
+    formats = frozenset(fmt.strip().lower() for fmt in format_arg.split(',') if fmt.strip())
+    unknown = formats - OUTPUT_FORMATS
+    if unknown:
+        raise ValueError(
+            f"Unknown output format(s): {', '.join(sorted(unknown))} "
+            f"(expected {', '.join(sorted(OUTPUT_FORMATS))})"
+        )
+    return formats or OUTPUT_FORMATS
+
+
+def json_loads(content: Union[bytes, str]) -> Any:
+    """
+    Parse JSON from bytes or text, using orjson when it is installed.
+
+    Bytes are parsed directly, so archive members can be handed over
+    without decoding them to a str first. Documents orjson cannot read
+    exactly (NaN/Infinity, integers wider than 64 bits) are parsed with
+    the stdlib json module, as they would be without orjson.
+
+    Args:
+        content: Raw JSON document (UTF-8 bytes or str)
+
+    Returns:
+        Parsed JSON content
+
+    Raises:
+        json.JSONDecodeError: If JSON is invalid
+    """
+    if orjson is not None:
+        wide_number = _WIDE_NUMBER_STR_RE if isinstance(content, str) else _WIDE_NUMBER_RE
+        if not wide_number.search(content):
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                pass  # e.g. NaN or Infinity, which only the stdlib accepts
+    return json.loads(content)
+
+
 def load_json(path: str) -> Any:
     """
     Load a JSON file with automatic encoding detection.
@@ -98,21 +198,77 @@ def load_json(path: str) -> Any:
     if not os.path.exists(path):
         raise FileNotFoundError(f"Export file not found: {path}")
 
-    # Try UTF-8 first (most common)
+    with open(path, 'rb') as f:
+        raw = f.read()
+
+    # Try UTF-8 first (most common), parsing the bytes directly
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except UnicodeDecodeError:
-        pass
+        return json_loads(raw)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        # orjson reports bad UTF-8 as a decode error; only fall through
+        # to encoding detection when the bytes really aren't UTF-8
+        if _is_utf8(raw):
+            raise
 
     # Detect encoding
-    with open(path, 'rb') as f:
-        raw = f.read()
-        detected = chardet.detect(raw)
-        encoding = detected.get('encoding', 'utf-8')
+    detected = chardet.detect(raw)
+    encoding = detected.get('encoding') or 'utf-8'
+    return json_loads(raw.decode(encoding))
 
-    with open(path, 'r', encoding=encoding) as f:
-        return json.load(f)
+
+def _is_utf8(raw: bytes) -> bool:
+    """Check whether a byte string decodes cleanly as UTF-8."""
+    try:
+        raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def load_json_collections(path: str, keys: Iterable[str]) -> Dict[str, Any]:
+    """
+    Load selected top-level keys from a JSON object export.
+
+    When ijson is installed the file is streamed and each value under
+    another key is dropped as soon as it has been parsed. Peak memory is
+    then the requested collections plus the largest single skipped value,
+    rather than the whole export. Without ijson, or for files it cannot
+    stream exactly (non-UTF-8, NaN/Infinity, integers wider than 64 bits),
+    the file is loaded with load_json and filtered.
+
+    Args:
+        path: Path to the JSON file
+        keys: Top-level keys to keep
+
+    Returns:
+        Dictionary containing only the requested keys that were present
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        json.JSONDecodeError: If JSON is invalid
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Export file not found: {path}")
+
+    wanted = set(keys)
+
+    if ijson is not None:
+        try:
+            with open(path, 'rb') as f:
+                return {
+                    key: value
+                    for key, value in ijson.kvitems(f, '', use_float=True)
+                    if key in wanted
+                }
+        except (ijson.JSONError, UnicodeDecodeError):
+            # Also raised for NaN/Infinity and integer overflow, which the
+            # stdlib fallback in load_json reads exactly
+            pass
+
+    data = load_json(path)
+    if not isinstance(data, dict):
+        return {}
+    return {key: value for key, value in data.items() if key in wanted}
 
 
 def load_csv(path: str) -> List[Dict]:
@@ -125,32 +281,85 @@ def load_csv(path: str) -> List[Dict]:
     Returns:
         List of dictionaries (one per row)
 
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    # Settle the encoding on raw bytes first, so a file that isn't UTF-8
+    # is parsed as CSV once rather than up to its first bad byte per attempt
+    encoding = detect_csv_encoding(path)
+
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        reader = csv.DictReader(f)
+        return list(reader)
+
+
+def detect_csv_encoding(path: str) -> str:
+    """
+    Find an encoding that decodes the whole file.
+
+    Tries utf-8-sig, utf-8, latin-1 and cp1252 in turn, then chardet. The
+    file is decoded incrementally in fixed-size chunks, so this works on
+    exports too large to hold in memory.
+
+    Args:
+        path: Path to the CSV file
+
+    Returns:
+        Encoding name suitable for open()
+
     Raises:
         FileNotFoundError: If file doesn't exist
     """
     if not os.path.exists(path):
         raise FileNotFoundError(f"Export file not found: {path}")
 
-    # Try common encodings
-    encodings = ['utf-8-sig', 'utf-8', 'latin-1', 'cp1252']
-
-    for encoding in encodings:
+    for encoding in ('utf-8-sig', 'utf-8', 'latin-1', 'cp1252'):
+        decoder = codecs.getincrementaldecoder(encoding)()
         try:
-            with open(path, 'r', encoding=encoding, newline='') as f:
-                reader = csv.DictReader(f)
-                return list(reader)
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    decoder.decode(chunk)
+            decoder.decode(b'', final=True)
+            return encoding
         except UnicodeDecodeError:
             continue
 
-    # Fall back to chardet
+    # Fall back to chardet on a sample
     with open(path, 'rb') as f:
-        raw = f.read()
-        detected = chardet.detect(raw)
-        encoding = detected.get('encoding', 'utf-8')
+        detected = chardet.detect(f.read(1 << 20))
+    return detected.get('encoding') or 'utf-8'
+
+
+def iter_csv_rows(path: str, encoding: str = None) -> Iterator[List[str]]:
+    """
+    Stream a CSV file as lists of cell values.
+
+    The first row yielded is the header. Blank lines after it are skipped,
+    as csv.DictReader does, but rows are not turned into dicts, so callers
+    can resolve column positions once and index each row directly.
+
+    Args:
+        path: Path to the CSV file
+        encoding: File encoding (detected with detect_csv_encoding if omitted)
+
+    Yields:
+        The header row, then each data row
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    if encoding is None:
+        encoding = detect_csv_encoding(path)
 
     with open(path, 'r', encoding=encoding, newline='') as f:
-        reader = csv.DictReader(f)
-        return list(reader)
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        yield header
+        for row in reader:
+            if row:
+                yield row
 
 
 def extract_zip(zip_path: str, extract_to: str = None) -> str:
@@ -212,8 +421,7 @@ def load_json_from_zip(zip_path: str, json_filename: str) -> Any:
     Returns:
         Parsed JSON content
     """
-    content = read_from_zip(zip_path, json_filename)
-    return json.loads(content.decode('utf-8'))
+    return json_loads(read_from_zip(zip_path, json_filename))
 
 
 def save_json(data: Any, path: str) -> None:
@@ -227,10 +435,102 @@ def save_json(data: Any, path: str) -> None:
     # Ensure parent directory exists
     os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
 
+    if orjson is not None:
+        try:
+            with open(path, 'wb') as f:
+                for chunk in _orjson_chunks(data):
+                    f.write(chunk)
+            return
+        except (TypeError, _NonFiniteFloat):
+            # e.g. integers beyond 64 bits, or NaN/Infinity, which orjson
+            # writes as null; the stdlib encoder handles these (and
+            # reopening the file below discards the partial output)
+            pass
+
     with open(path, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, default=str, ensure_ascii=False)
 
 
+class _NonFiniteFloat(Exception):
+    """Raised by _orjson_chunks when a value holds NaN or Infinity."""
+
+
+def _has_non_finite_float(value: Any) -> bool:
+    """Return True if value contains a NaN or infinite float, at any depth."""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def _orjson_dumps(value: Any) -> bytes:
+    """orjson.dumps with save_json's options, refusing NaN and Infinity."""
+    encoded = orjson.dumps(value, default=str, option=ORJSON_SAVE_OPTIONS)
+    # orjson writes non-finite floats as null; only values that produced a
+    # null need the (slower) walk to tell them apart from None
+    if b'null' in encoded and _has_non_finite_float(value):
+        raise _NonFiniteFloat()
+    return encoded
+
+
+def _orjson_chunks(data: Any) -> Iterator[bytes]:
+    """
+    Yield save_json's orjson encoding of data in pieces.
+
+    A top-level dict is encoded one value at a time, and list values one
+    item at a time, each re-indented to its place in the document, so the
+    encoding of a large record list is never held in memory all at once.
+    """
+    if type(data) is not dict or not data or not all(type(key) is str for key in data):
+        yield _orjson_dumps(data)
+        return
+
+    yield b'{'
+    for i, (key, value) in enumerate(data.items()):
+        yield (b',\n  ' if i else b'\n  ') + orjson.dumps(key) + b': '
+        if type(value) is list and value:
+            yield b'['
+            for j, item in enumerate(value):
+                encoded = _orjson_dumps(item)
+                # Encoded strings escape newlines, so every newline is layout
+                yield (b',\n    ' if j else b'\n    ') + encoded.replace(b'\n', b'\n    ')
+            yield b'\n  ]'
+        else:
+            encoded = _orjson_dumps(value)
+            yield encoded.replace(b'\n', b'\n  ')
+    yield b'\n}'
+
+
+def run_concurrently(*tasks: Callable[[], Any]) -> List[Any]:
+    """
+    Run independent I/O-bound tasks on a thread pool.
+
+    Used to write a processor's output files (DOCX, JSON, redaction key)
+    at the same time. All tasks run to completion; if any failed, the
+    exception of the first failing task in the order given (not the first
+    to fail in time) is then re-raised.
+
+    Args:
+        *tasks: Zero-argument callables (e.g., functools.partial objects)
+
+    Returns:
+        Task results in the order the tasks were given
+    """
+    if not tasks:
+        return []
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = [executor.submit(task) for task in tasks]
+    return [future.result() for future in futures]
+
+
 def ensure_output_dir(output_dir: str) -> str:
     """
     Ensure an output directory exists, creating it if necessary.
@@ -281,6 +581,15 @@ def format_date(date_str: str) -> str:
     if not date_str:
         return 'N/A'
 
+    # Exports repeat the same timestamps heavily; cache hashable inputs
+    if isinstance(date_str, (str, int, float)):
+        return _parse_date(date_str)
+    return _parse_date.__wrapped__(date_str)
+
+
+@lru_cache(maxsize=8192, typed=True)
+def _parse_date(date_str: Any) -> str:
+    """Parse and format a non-empty date value (see format_date)."""
     # Common date formats to try
     formats = [
         '%Y-%m-%dT%H:%M:%S.%fZ',      # ISO 8601 with microseconds and Z
@@ -327,6 +636,122 @@ def format_date(date_str: str) -> str:
     return str(date_str)[:20]
 
 
+def extract_fields(raw: Dict, fields: Iterable[tuple]) -> Dict[str, Any]:
+    """
+    Build a labelled profile dict from a field schema.
+
+    Each schema entry is (label, source) or (label, source, formatter).
+    A string source is looked up in the raw record; a tuple of keys is
+    tried in order, like raw.get(a) or raw.get(b), for exports that name
+    a field differently; a callable source is called with the whole record
+    for computed fields. The optional formatter (e.g. format_date) is
+    applied to the value.
+
+    Args:
+        raw: Raw vendor record
+        fields: Ordered schema of field specs
+
+    Returns:
+        Dictionary of label -> value in schema order
+    """
+    get = raw.get
+    profile = {}
+    for label, source, *formatter in fields:
+        if type(source) is tuple:
+            for key in source:
+                value = get(key)
+                if value:
+                    break
+        elif callable(source):
+            value = source(raw)
+        else:
+            value = get(source)
+        if formatter:
+            value = formatter[0](value)
+        profile[label] = value
+    return profile
+
+
+def join_fields(raw: Dict, sources: Iterable[Union[str, tuple]], sep: str = ' ') -> str:
+    """
+    Join the non-empty values of several fields, e.g. address lines.
+
+    Sources are single keys or tuples of alternative keys, as in
+    extract_fields; each alternative is only looked up when the ones
+    before it are empty. Empty values are skipped rather than leaving
+    doubled separators.
+
+    Args:
+        raw: Raw vendor record
+        sources: Ordered field keys or key-alias tuples
+        sep: Separator placed between values
+
+    Returns:
+        Joined string ('' if every field is empty)
+    """
+    get = raw.get
+    parts = []
+    for source in sources:
+        if type(source) is tuple:
+            for key in source:
+                value = get(key)
+                if value:
+                    break
+        else:
+            value = get(source)
+        if value:
+            value = str(value).strip()
+            if value:
+                parts.append(value)
+    return sep.join(parts)
+
+
+class _IdLookupKeys(frozenset):
+    """Frozenset of an id's equivalent raw values (see id_lookup_keys)."""
+
+    __slots__ = ('text',)
+
+    def __new__(cls, values: Iterable, text: str):
+        keys = super().__new__(cls, values)
+        keys.text = text
+        return keys
+
+    def __contains__(self, value: Any) -> bool:
+        # Only str and int hash alike exactly when their string forms match;
+        # anything else (floats, bools, unhashable lists) is compared as text
+        if type(value) is str or type(value) is int:
+            return frozenset.__contains__(self, value)
+        return str(value) == self.text
+
+
+def id_lookup_keys(id_value: Any) -> frozenset:
+    """
+    Return the raw values that match an id by its string form.
+
+    Lets callers test each export row's raw id with one set lookup instead
+    of calling str() on every row: `raw in id_lookup_keys(ds_id)` is
+    equivalent to `str(raw) == str(ds_id)`. The string form always
+    matches; the int form is included when it prints back as the same
+    text, so '42' also matches 42 but '042' does not. Values of other
+    types (e.g. 42.0, True, or an unhashable list) fall back to comparing
+    str(raw).
+
+    Args:
+        id_value: The id to match (e.g. the data subject's id)
+
+    Returns:
+        Frozenset of equivalent raw id values
+    """
+    text = str(id_value)
+    try:
+        number = int(text)
+    except ValueError:
+        return _IdLookupKeys((text,), text)
+    if str(number) != text:
+        return _IdLookupKeys((text,), text)
+    return _IdLookupKeys((text, number), text)
+
+
 def truncate(text: str, max_length: int = 500) -> str:
     """
     Truncate text to a maximum length with ellipsis.
@@ -346,12 +771,28 @@ def truncate(text: str, max_length: int = 500) -> str:
     return text[:max_length - 3] + '...'
 
 
-def strip_html(html_content: str) -> str:
+# Longest input strip_html caches; long bodies are rarely repeated verbatim
+STRIP_HTML_CACHE_MAX_LENGTH = 1024
+
+# With max_length, strip_html first tries this many input chars per output char
+STRIP_HTML_PREFIX_FACTOR = 10
+
+# Patterns used by _strip_html, compiled once rather than looked up per call
+_BR_TAG_RE = re.compile(r'<br\s*/?>', re.IGNORECASE)
+_P_OPEN_TAG_RE = re.compile(r'<p[^>]*>', re.IGNORECASE)
+_P_CLOSE_TAG_RE = re.compile(r'</p>', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+
+def strip_html(html_content: str, max_length: int = None) -> str:
     """
     Remove HTML tags and decode entities from text.
 
     Args:
         html_content: HTML string to clean
+        max_length: If given, return only this many characters of the
+            result; long inputs are then only stripped as far as needed
 
     Returns:
         Plain text with HTML removed
@@ -359,17 +800,59 @@ def strip_html(html_content: str) -> str:
     if not html_content:
         return ''
 
+    text = str(html_content)
+    if max_length is not None:
+        return _strip_html_prefix(text, max_length)
+
+    # Short fragments (names, titles, boilerplate) repeat a lot; cache them
+    if len(text) <= STRIP_HTML_CACHE_MAX_LENGTH:
+        return _strip_html_cached(text)
+    return _strip_html(text)
+
+
+@lru_cache(maxsize=8192)
+def _strip_html_cached(text: str) -> str:
+    """Cached wrapper around _strip_html for short inputs."""
+    return _strip_html(text)
+
+
+def _strip_html_prefix(text: str, max_length: int) -> str:
+    """Return strip_html(text)[:max_length], stripping only a prefix when that suffices."""
+    cut = max_length * STRIP_HTML_PREFIX_FACTOR
+    if len(text) > cut:
+        # A prefix strips to a prefix of the full result as long as no tag or
+        # entity straddles the cut, so cut just after the last '>' if needed.
+        # A '<' left in the result may be a tag the cut left unclosed.
+        tail_start = text.rfind('>', 0, cut) + 1
+        tail = text[tail_start:cut]
+        if '<' in tail or '&' in tail:
+            cut = tail_start
+        if cut:
+            stripped = strip_html(text[:cut])
+            if len(stripped) >= max_length and '<' not in stripped:
+                return stripped[:max_length]
+    return strip_html(text)[:max_length]
+
+
+def _strip_html(text: str) -> str:
+    """Strip tags and entities from a non-empty string (see strip_html)."""
+    # Most record bodies are plain text, with nothing to decode or remove
+    if '<' not in text and '&' not in text:
+        if '\n\n\n' in text:
+            text = _BLANK_LINES_RE.sub('\n\n', text)
+        return text.strip()
+
     # Decode HTML entities
-    text = html.unescape(str(html_content))
+    text = html.unescape(text)
 
     # Remove HTML tags
-    text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
-    text = re.sub(r'<p[^>]*>', '\n', text, flags=re.IGNORECASE)
-    text = re.sub(r'</p>', '\n', text, flags=re.IGNORECASE)
-    text = re.sub(r'<[^>]+>', '', text)
+    text = _BR_TAG_RE.sub('\n', text)
+    text = _P_OPEN_TAG_RE.sub('\n', text)
+    text = _P_CLOSE_TAG_RE.sub('\n', text)
+    text = _TAG_RE.sub('', text)
 
     # Clean up whitespace
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _BLANK_LINES_RE.sub('\n\n', text)
     text = text.strip()
 
     return text
@@ -435,6 +918,45 @@ def get_timestamp() -> str:
     return datetime.now().strftime('%Y%m%d_%H%M%S')
 
 
+def find_name_matches(name: str, candidates: List[Optional[str]]) -> List[int]:
+    """
+    Find candidate names that contain, or are contained in, a search name.
+
+    This is the case-insensitive two-way substring test the processors use
+    to locate a data subject. With rapidfuzz installed the whole candidate
+    list is scored in a single call (a partial_ratio of 100 is exactly a
+    substring match); otherwise a plain loop is used. Empty candidates
+    never match.
+
+    Args:
+        name: Name being searched for
+        candidates: Candidate names (None is treated as empty)
+
+    Returns:
+        Indices of matching candidates, in candidate order
+    """
+    name_lower = name.lower()
+    if not name_lower:
+        return []
+
+    lowered = [(c or '').lower() for c in candidates]
+
+    if rf_process is not None:
+        scored = rf_process.extract(
+            name_lower, lowered,
+            scorer=rf_fuzz.partial_ratio,
+            processor=None,
+            score_cutoff=100,
+            limit=None,
+        )
+        return sorted(index for _, _, index in scored)
+
+    return [
+        i for i, candidate in enumerate(lowered)
+        if candidate and (name_lower in candidate or candidate in name_lower)
+    ]
+
+
 class AmbiguousMatchError(Exception):
     """
     Raised when multiple users match the data subject criteria.
@@ -210,7 +210,7 @@ def extract_records(
                 'date': format_date(activity.get('due_date') or activity.get('add_time')),
                 'type': activity.get('type', 'activity'),
                 'category': 'Activities',
-                'content': f"Activity: {activity.get('subject')}\nType: {activity.get('type')}\nDone: {activity.get('done')}\nNote: {strip_html(activity.get('note', '') or '')[:500]}",
+                'content': f"Activity: {activity.get('subject')}\nType: {activity.get('type')}\nDone: {activity.get('done')}\nNote: {strip_html(activity.get('note', '') or '', 500)}",
             })
 
     # Notes
@@ -13,36 +13,53 @@ Usage:
 import sys
 import os
 import time
+from functools import partial
+from operator import itemgetter
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.redaction import RedactionEngine
 from core.docgen import create_vendor_report
 from core.utils import (
-    setup_argparser, parse_extra_redactions, load_json, save_json,
+    setup_argparser, parse_extra_redactions, load_json_collections, save_json,
     ensure_output_dir, safe_filename, format_date, get_timestamp,
-    validate_data_subject_match, strip_html,
+    validate_data_subject_match, strip_html, extract_fields,
+    run_concurrently,
 )
 from core.activity_log import log_event
 
 VENDOR_NAME = "Salesforce"
 
+# Top-level collections read from the export; everything else (Accounts,
+# Leads, ...) is skipped while streaming so large org exports stay bounded.
+EXPORT_COLLECTIONS = (
+    'contacts', 'Contact',
+    'users', 'User',
+    'activities', 'Task',
+    'cases', 'Case',
+    'opportunities', 'Opportunity',
+    'email_messages', 'EmailMessage',
+)
+
 
 def find_data_subject(data: Dict[str, Any], name: str, email: str = None) -> Optional[Dict]:
     contacts = data.get('contacts', data.get('Contact', []))
     matches = []
     name_lower = name.lower()
+    email_lower = email.lower() if email else None
 
     for contact in contacts:
-        contact_email = (contact.get('Email') or '').lower()
-        full_name = f"{contact.get('FirstName', '')} {contact.get('LastName', '')}".strip().lower()
+        # Build the display name once and reuse it for matching and output
+        full_name = f"{contact.get('FirstName', '')} {contact.get('LastName', '')}".strip()
+        full_name_lower = full_name.lower()
 
-        if (email and contact_email == email.lower()) or (name_lower in full_name or full_name in name_lower):
+        email_match = email_lower and (contact.get('Email') or '').lower() == email_lower
+        if email_match or (full_name_lower and (name_lower in full_name_lower or full_name_lower in name_lower)):
             matches.append({
                 'id': contact.get('Id'),
-                'name': f"{contact.get('FirstName', '')} {contact.get('LastName', '')}".strip(),
+                'name': full_name,
                 'email': contact.get('Email'),
                 'raw': contact,
             })
@@ -50,41 +67,39 @@ def find_data_subject(data: Dict[str, Any], name: str, email: str = None) -> Opt
     return validate_data_subject_match(matches, name, email)
 
 
-def extract_users(data: Dict[str, Any]) -> Dict[str, Dict]:
-    users = {}
+def extract_users(data: Dict[str, Any]) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
     for contact in data.get('contacts', data.get('Contact', [])):
         if contact.get('Id'):
-            users[contact['Id']] = {
-                'name': f"{contact.get('FirstName', '')} {contact.get('LastName', '')}".strip(),
-                'email': contact.get('Email'),
-            }
+            yield (
+                contact['Id'],
+                f"{contact.get('FirstName', '')} {contact.get('LastName', '')}".strip(),
+                contact.get('Email'),
+            )
     for user in data.get('users', data.get('User', [])):
         if user.get('Id'):
-            users[user['Id']] = {
-                'name': user.get('Name'),
-                'email': user.get('Email'),
-            }
-    return users
+            yield user['Id'], user.get('Name'), user.get('Email')
+
+
+PROFILE_FIELDS = (
+    ('Contact ID', 'Id'),
+    ('First Name', 'FirstName'),
+    ('Last Name', 'LastName'),
+    ('Email', 'Email'),
+    ('Phone', 'Phone'),
+    ('Mobile', 'MobilePhone'),
+    ('Title', 'Title'),
+    ('Department', 'Department'),
+    ('Account', lambda raw: raw['Account'].get('Name') if isinstance(raw.get('Account'), dict) else raw.get('AccountId')),
+    ('Mailing Address', lambda raw: f"{raw.get('MailingStreet', '')} {raw.get('MailingCity', '')} {raw.get('MailingState', '')} {raw.get('MailingPostalCode', '')} {raw.get('MailingCountry', '')}".strip()),
+    ('Created Date', 'CreatedDate', format_date),
+    ('Last Modified', 'LastModifiedDate', format_date),
+    ('Lead Source', 'LeadSource'),
+    ('Owner', lambda raw: raw['Owner'].get('Name') if isinstance(raw.get('Owner'), dict) else raw.get('OwnerId')),
+)
 
 
 def extract_profile(data_subject: Dict) -> Dict[str, Any]:
-    raw = data_subject.get('raw', {})
-    return {
-        'Contact ID': raw.get('Id'),
-        'First Name': raw.get('FirstName'),
-        'Last Name': raw.get('LastName'),
-        'Email': raw.get('Email'),
-        'Phone': raw.get('Phone'),
-        'Mobile': raw.get('MobilePhone'),
-        'Title': raw.get('Title'),
-        'Department': raw.get('Department'),
-        'Account': raw.get('Account', {}).get('Name') if isinstance(raw.get('Account'), dict) else raw.get('AccountId'),
-        'Mailing Address': f"{raw.get('MailingStreet', '')} {raw.get('MailingCity', '')} {raw.get('MailingState', '')} {raw.get('MailingPostalCode', '')} {raw.get('MailingCountry', '')}".strip(),
-        'Created Date': format_date(raw.get('CreatedDate')),
-        'Last Modified': format_date(raw.get('LastModifiedDate')),
-        'Lead Source': raw.get('LeadSource'),
-        'Owner': raw.get('Owner', {}).get('Name') if isinstance(raw.get('Owner'), dict) else raw.get('OwnerId'),
-    }
+    return extract_fields(data_subject.get('raw', {}), PROFILE_FIELDS)
 
 
 def extract_records(data: Dict[str, Any], data_subject_id: str, data_subject_email: str = None) -> List[Dict]:
@@ -134,7 +149,7 @@ def extract_records(data: Dict[str, Any], data_subject_id: str, data_subject_ema
                 'content': f"Subject: {email.get('Subject')}\nFrom: {email.get('FromAddress')}\nTo: {email.get('ToAddress')}\nBody: {strip_html(email.get('TextBody') or email.get('HtmlBody', '') or '')}",
             })
 
-    records.sort(key=lambda r: r.get('date', ''), reverse=True)
+    records.sort(key=itemgetter('date'), reverse=True)
     return records
 
 
@@ -142,8 +157,10 @@ def process(export_path: str, data_subject_name: str, data_subject_email: str =
             extra_redactions: List[str] = None, output_dir: str = './output') -> tuple:
     start_time = time.time()
 
-    ensure_output_dir(output_dir)
-    ensure_output_dir(os.path.join(output_dir, 'internal'))
+    # Creating the internal dir also creates output_dir
+    internal_dir = os.path.join(output_dir, 'internal')
+    ensure_output_dir(internal_dir)
+    export_filename = os.path.basename(export_path)
 
     log_event(
         'processing_started',
@@ -151,12 +168,12 @@ def process(export_path: str, data_subject_name: str, data_subject_email: str =
         vendor=VENDOR_NAME,
         data_subject_name=data_subject_name,
         data_subject_email=data_subject_email,
-        export_file=os.path.basename(export_path),
+        export_file=export_filename,
     )
 
     try:
         print(f"Loading {VENDOR_NAME} export...")
-        data = load_json(export_path)
+        data = load_json_collections(export_path, EXPORT_COLLECTIONS)
 
         print(f"Searching for data subject: {data_subject_name}...")
         data_subject = find_data_subject(data, data_subject_name, data_subject_email)
@@ -164,8 +181,7 @@ def process(export_path: str, data_subject_name: str, data_subject_email: str =
         print(f"  Found: {data_subject['name']}")
 
         engine = RedactionEngine(data_subject_name, data_subject_email)
-        for user_id, user_info in extract_users(data).items():
-            engine.add_user(user_id, user_info.get('name'), user_info.get('email'))
+        engine.add_users_bulk(extract_users(data))
         for name in (extra_redactions or []):
             engine.add_external(name)
 
@@ -178,21 +194,24 @@ def process(export_path: str, data_subject_name: str, data_subject_email: str =
 
         safe_name = safe_filename(data_subject_name)
         timestamp = get_timestamp()
+        report_name = f"{VENDOR_NAME}_DSAR_{safe_name}_{timestamp}"
 
         doc = create_vendor_report(VENDOR_NAME, data_subject_name, data_subject_email,
                                    profile, redacted_records, redaction_stats=engine.get_stats(),
-                                   export_filename=os.path.basename(export_path))
-        docx_path = os.path.join(output_dir, f"{VENDOR_NAME}_DSAR_{safe_name}_{timestamp}.docx")
-        doc.save(docx_path)
+                                   export_filename=export_filename)
+        docx_path = os.path.join(output_dir, f"{report_name}.docx")
 
         json_data = {'vendor': VENDOR_NAME, 'data_subject': data_subject_name, 'email': data_subject_email,
                      'generated': datetime.now().isoformat(), 'profile': profile, 'records': redacted_records,
                      'record_count': len(redacted_records)}
-        json_path = os.path.join(output_dir, f"{VENDOR_NAME}_DSAR_{safe_name}_{timestamp}.json")
-        save_json(json_data, json_path)
+        json_path = os.path.join(output_dir, f"{report_name}.json")
+        key_path = os.path.join(internal_dir, f"{VENDOR_NAME}_REDACTION_KEY_{safe_name}_{timestamp}.json")
 
-        key_path = os.path.join(output_dir, 'internal', f"{VENDOR_NAME}_REDACTION_KEY_{safe_name}_{timestamp}.json")
-        save_json(engine.get_redaction_key(), key_path)
+        run_concurrently(
+            partial(doc.save, docx_path),
+            partial(save_json, json_data, json_path),
+            partial(save_json, engine.get_redaction_key(), key_path),
+        )
 
         stats = engine.get_stats()
         print(f"\n✓ {VENDOR_NAME}: {len(redacted_records)} records processed")
@@ -209,7 +228,7 @@ def process(export_path: str, data_subject_name: str, data_subject_email: str =
             records_found=len(records),
             records_processed=len(redacted_records),
             redaction_stats=stats,
-            files_generated=[os.path.basename(docx_path), os.path.basename(json_path)],
+            files_generated=[f"{report_name}.docx", f"{report_name}.json"],
             execution_time_seconds=round(elapsed, 2),
         )
 
@@ -17,8 +17,11 @@ import zipfile
 import tarfile
 import json
 import time
+from functools import partial
+from itertools import chain
+from operator import itemgetter
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -35,6 +38,9 @@ from core.utils import (
     get_timestamp,
     validate_data_subject_match,
     strip_html,
+    json_loads,
+    extract_fields,
+    run_concurrently,
 )
 from core.activity_log import log_event
 
@@ -51,20 +57,55 @@ def load_export(export_path: str) -> Dict[str, Any]:
         return load_json(export_path)
 
 
-def load_archive_json(archive, name: str, is_tar: bool = False) -> Any:
-    """Load JSON from archive file."""
+def load_archive_json(archive, member, is_tar: bool = False) -> Any:
+    """Load JSON from archive file (a ZIP name or a TarInfo member)."""
     try:
         if is_tar:
-            member = archive.getmember(name)
             f = archive.extractfile(member)
             if f:
-                return json.loads(f.read().decode('utf-8'))
+                return json_loads(f.read())
         else:
-            return json.loads(archive.read(name).decode('utf-8'))
+            return json_loads(archive.read(member))
     except (KeyError, json.JSONDecodeError, UnicodeDecodeError):
         return None
 
 
+# Archive file basename substring -> export bucket, first match wins
+ARCHIVE_BUCKETS = (
+    ('repos', 'repositories'),
+    ('issues', 'issues'),
+    ('pull', 'pull_requests'),
+    ('comment', 'comments'),
+    ('commit', 'commits'),
+)
+
+
+def bucket_for(basename: str) -> Optional[str]:
+    """Return the export bucket for a lowercased archive file basename."""
+    for key, bucket in ARCHIVE_BUCKETS:
+        if key in basename:
+            return bucket
+    return None
+
+
+def add_archive_content(data: Dict[str, Any], name: str, content: Any) -> None:
+    """File parsed archive JSON into the matching bucket of the export data."""
+    basename = os.path.basename(name).lower()
+
+    if 'user' in basename and isinstance(content, dict):
+        data['user'] = content
+        data['users'].append(content)
+        return
+
+    bucket = bucket_for(basename)
+    if bucket is None:
+        return
+    if isinstance(content, list):
+        data[bucket].extend(content)
+    elif bucket == 'repositories' and isinstance(content, dict):
+        data[bucket].append(content)
+
+
 def load_zip_export(zip_path: str) -> Dict[str, Any]:
     """Load and parse GitHub ZIP export."""
     data = {
@@ -86,28 +127,7 @@ def load_zip_export(zip_path: str) -> Dict[str, Any]:
             if not content:
                 continue
 
-            basename = os.path.basename(name).lower()
-
-            if 'user' in basename and isinstance(content, dict):
-                data['user'] = content
-                data['users'].append(content)
-            elif 'repositories' in basename or 'repos' in basename:
-                if isinstance(content, list):
-                    data['repositories'].extend(content)
-                elif isinstance(content, dict):
-                    data['repositories'].append(content)
-            elif 'issues' in basename:
-                if isinstance(content, list):
-                    data['issues'].extend(content)
-            elif 'pull' in basename:
-                if isinstance(content, list):
-                    data['pull_requests'].extend(content)
-            elif 'comment' in basename:
-                if isinstance(content, list):
-                    data['comments'].extend(content)
-            elif 'commit' in basename:
-                if isinstance(content, list):
-                    data['commits'].extend(content)
+            add_archive_content(data, name, content)
 
     return data
 
@@ -124,35 +144,17 @@ def load_tar_export(tar_path: str) -> Dict[str, Any]:
         'commits': [],
     }
 
-    with tarfile.open(tar_path, 'r:gz') as tf:
-        for member in tf.getmembers():
-            if not member.name.endswith('.json'):
+    # Stream mode reads members sequentially without building the index
+    with tarfile.open(tar_path, 'r|gz') as tf:
+        for member in tf:
+            if not member.isfile() or not member.name.endswith('.json'):
                 continue
 
-            content = load_archive_json(tf, member.name, is_tar=True)
+            content = load_archive_json(tf, member, is_tar=True)
             if not content:
                 continue
 
-            basename = os.path.basename(member.name).lower()
-
-            if 'user' in basename and isinstance(content, dict):
-                data['user'] = content
-                data['users'].append(content)
-            elif 'repositories' in basename or 'repos' in basename:
-                if isinstance(content, list):
-                    data['repositories'].extend(content)
-            elif 'issues' in basename:
-                if isinstance(content, list):
-                    data['issues'].extend(content)
-            elif 'pull' in basename:
-                if isinstance(content, list):
-                    data['pull_requests'].extend(content)
-            elif 'comment' in basename:
-                if isinstance(content, list):
-                    data['comments'].extend(content)
-            elif 'commit' in basename:
-                if isinstance(content, list):
-                    data['commits'].extend(content)
+            add_archive_content(data, member.name, content)
 
     return data
 
@@ -192,60 +194,57 @@ def find_data_subject(
     return validate_data_subject_match(matches, name, email)
 
 
-def extract_users(data: Dict[str, Any]) -> Dict[str, Dict]:
-    """Extract all users for redaction mapping."""
-    users = {}
+def extract_users(data: Dict[str, Any]) -> Iterator[Tuple[str, Optional[str], Optional[str], List[str]]]:
+    """
+    Yield (user_id, name, email, aliases) for redaction mapping.
+
+    Each identifier is yielded once: a user's login is passed as an alias
+    of their ID instead of being inserted as a second entry.
+    """
+    seen = set()
 
     # Main users
-    for user in data.get('users', []):
-        user_id = str(user.get('id') or user.get('login', ''))
-        if user_id:
-            users[user_id] = {
-                'name': user.get('name') or user.get('login'),
-                'email': user.get('email'),
-            }
-        if user.get('login'):
-            users[user.get('login')] = {
-                'name': user.get('name') or user.get('login'),
-                'email': user.get('email'),
-            }
+    for user in data.get('users', ()):
+        login = user.get('login')
+        user_id = str(user.get('id') or login or '')
+        if not user_id or user_id in seen:
+            continue
+        aliases = [login] if login and login != user_id else []
+        seen.add(user_id)
+        seen.update(aliases)
+        yield user_id, user.get('name') or login, user.get('email'), aliases
 
     # Extract from issues/PRs/comments
-    for issue in data.get('issues', []) + data.get('pull_requests', []):
-        author = issue.get('user', {})
-        if author.get('login'):
-            users[author['login']] = {'name': author.get('login'), 'email': None}
-
-    for comment in data.get('comments', []):
-        author = comment.get('user', {})
-        if author.get('login'):
-            users[author['login']] = {'name': author.get('login'), 'email': None}
-
-    return users
+    for item in chain(data.get('issues', ()), data.get('pull_requests', ()), data.get('comments', ())):
+        login = (item.get('user') or {}).get('login')
+        if login and login not in seen:
+            seen.add(login)
+            yield login, login, None, []
+
+
+PROFILE_FIELDS = (
+    ('User ID', 'id'),
+    ('Login', 'login'),
+    ('Name', 'name'),
+    ('Email', 'email'),
+    ('Company', 'company'),
+    ('Location', 'location'),
+    ('Bio', 'bio'),
+    ('Blog', 'blog'),
+    ('Twitter', 'twitter_username'),
+    ('Public Repos', 'public_repos'),
+    ('Public Gists', 'public_gists'),
+    ('Followers', 'followers'),
+    ('Following', 'following'),
+    ('Created At', 'created_at', format_date),
+    ('Updated At', 'updated_at', format_date),
+    ('Two Factor', 'two_factor_authentication'),
+)
 
 
 def extract_profile(data_subject: Dict) -> Dict[str, Any]:
     """Extract profile data for the data subject."""
-    raw = data_subject.get('raw', {})
-
-    return {
-        'User ID': raw.get('id'),
-        'Login': raw.get('login'),
-        'Name': raw.get('name'),
-        'Email': raw.get('email'),
-        'Company': raw.get('company'),
-        'Location': raw.get('location'),
-        'Bio': raw.get('bio'),
-        'Blog': raw.get('blog'),
-        'Twitter': raw.get('twitter_username'),
-        'Public Repos': raw.get('public_repos'),
-        'Public Gists': raw.get('public_gists'),
-        'Followers': raw.get('followers'),
-        'Following': raw.get('following'),
-        'Created At': format_date(raw.get('created_at')),
-        'Updated At': format_date(raw.get('updated_at')),
-        'Two Factor': raw.get('two_factor_authentication'),
-    }
+    return extract_fields(data_subject.get('raw', {}), PROFILE_FIELDS)
 
 
 def extract_records(
@@ -274,7 +273,9 @@ def extract_records(
             return False
         login = (user_obj.get('login') or '').lower()
         user_id = str(user_obj.get('id', ''))
-        return login == ds_login or user_id == ds_id
+        # Logins and ids are compared separately: a login may be all digits
+        # and equal to the subject's id. Blank subject fields never match.
+        return bool((ds_login and login == ds_login) or (ds_id and user_id == ds_id))
 
     def is_mentioned_in(text: str) -> bool:
         """Check if data subject is mentioned in text."""
@@ -377,7 +378,7 @@ def extract_records(
         author_email = (author.get('email') or '').lower()
         author_login = (author.get('login') or '').lower()
 
-        if author_login == ds_login or author_email == ds_email:
+        if (ds_login and author_login == ds_login) or (ds_email and author_email == ds_email):
             message = commit.get('commit', {}).get('message', commit.get('message', ''))
             records.append({
                 'date': format_date(commit.get('commit', {}).get('author', {}).get('date') or commit.get('date')),
@@ -388,7 +389,7 @@ def extract_records(
             })
 
     # Sort by date
-    records.sort(key=lambda r: r.get('date', ''), reverse=True)
+    records.sort(key=itemgetter('date'), reverse=True)
     return records
 
 
@@ -402,8 +403,10 @@ def process(
     """Process a GitHub export for DSAR response."""
     start_time = time.time()
 
-    ensure_output_dir(output_dir)
-    ensure_output_dir(os.path.join(output_dir, 'internal'))
+    # Creating the internal dir also creates output_dir
+    internal_dir = os.path.join(output_dir, 'internal')
+    ensure_output_dir(internal_dir)
+    export_filename = os.path.basename(export_path)
 
     log_event(
         'processing_started',
@@ -411,7 +414,7 @@ def process(
         vendor=VENDOR_NAME,
         data_subject_name=data_subject_name,
         data_subject_email=data_subject_email,
-        export_file=os.path.basename(export_path),
+        export_file=export_filename,
     )
 
     try:
@@ -425,9 +428,7 @@ def process(
         print("Building redaction map...")
         engine = RedactionEngine(data_subject_name, data_subject_email)
 
-        users = extract_users(data)
-        for user_id, user_info in users.items():
-            engine.add_user(user_id, user_info.get('name'), user_info.get('email'))
+        engine.add_users_bulk(extract_users(data))
         print(f"  Mapped {engine.get_total_redactions()} users for redaction")
 
         for name in (extra_redactions or []):
@@ -441,15 +442,14 @@ def process(
         print(f"  Found {len(records)} records for data subject")
 
         print("Applying redactions...")
-        redacted_records = []
-        for record in records:
-            redacted = record.copy()
-            if 'content' in redacted:
-                redacted['content'] = engine.redact(str(redacted['content']))
-            redacted_records.append(redacted)
+        redacted_records = [
+            {**record, 'content': engine.redact(str(record['content']))}
+            for record in records
+        ]
 
         safe_name = safe_filename(data_subject_name)
         timestamp = get_timestamp()
+        report_name = f"{VENDOR_NAME}_DSAR_{safe_name}_{timestamp}"
 
         print("Generating Word report...")
         doc = create_vendor_report(
@@ -459,10 +459,9 @@ def process(
             profile_data=profile,
             records=redacted_records,
             redaction_stats=engine.get_stats(),
-            export_filename=os.path.basename(export_path)
+            export_filename=export_filename
         )
-        docx_path = os.path.join(output_dir, f"{VENDOR_NAME}_DSAR_{safe_name}_{timestamp}.docx")
-        doc.save(docx_path)
+        docx_path = os.path.join(output_dir, f"{report_name}.docx")
 
         print("Generating JSON export...")
         json_data = {
@@ -474,11 +473,15 @@ def process(
             'records': redacted_records,
             'record_count': len(redacted_records),
         }
-        json_path = os.path.join(output_dir, f"{VENDOR_NAME}_DSAR_{safe_name}_{timestamp}.json")
-        save_json(json_data, json_path)
-
-        key_path = os.path.join(output_dir, 'internal', f"{VENDOR_NAME}_REDACTION_KEY_{safe_name}_{timestamp}.json")
-        save_json(engine.get_redaction_key(), key_path)
+        json_path = os.path.join(output_dir, f"{report_name}.json")
+        key_path = os.path.join(internal_dir, f"{VENDOR_NAME}_REDACTION_KEY_{safe_name}_{timestamp}.json")
+
+        # The three outputs are independent; write them concurrently
+        run_concurrently(
+            partial(doc.save, docx_path),
+            partial(save_json, json_data, json_path),
+            partial(save_json, engine.get_redaction_key(), key_path),
+        )
 
         stats = engine.get_stats()
         print(f"\n✓ {VENDOR_NAME}: {len(redacted_records)} records processed")
@@ -497,7 +500,7 @@ def process(
             records_found=len(records),
             records_processed=len(redacted_records),
             redaction_stats=stats,
-            files_generated=[os.path.basename(docx_path), os.path.basename(json_path)],
+            files_generated=[f"{report_name}.docx", f"{report_name}.json"],
             execution_time_seconds=round(elapsed, 2),
         )
 
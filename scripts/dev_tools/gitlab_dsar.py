@@ -9,6 +9,7 @@ Format: JSON/tar.gz with user data, projects, issues, merge requests, and commen
 Usage:
     python gitlab_dsar.py export.json "John Smith" --email john@company.com
     python gitlab_dsar.py export.tar.gz "John Smith" --email john@company.com
+    python gitlab_dsar.py extracted_export/ "John Smith" --email john@company.com
 """
 
 import sys
@@ -17,7 +18,9 @@ import tarfile
 import json
 import time
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from itertools import chain
+from operator import itemgetter
+from typing import Dict, List, Any, Callable, Iterator, Optional
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -26,31 +29,48 @@ from core.docgen import create_vendor_report
 from core.utils import (
     setup_argparser,
     parse_extra_redactions,
-    load_json,
+    load_json_collections,
     save_json,
     ensure_output_dir,
     safe_filename,
     format_date,
     get_timestamp,
     validate_data_subject_match,
+    find_name_matches,
     strip_html,
+    json_loads,
+    id_lookup_keys,
 )
 from core.activity_log import log_event
 
 VENDOR_NAME = "GitLab"
 
+# Top-level collections read from a JSON export; anything else is skipped
+# while streaming so large exports stay bounded
+EXPORT_COLLECTIONS = (
+    'user', 'users',
+    'projects',
+    'issues',
+    'merge_requests',
+    'comments', 'notes',
+    'snippets',
+    'events',
+)
+
 
 def load_export(export_path: str) -> Dict[str, Any]:
-    """Load GitLab export from tar.gz or JSON."""
-    if export_path.endswith('.tar.gz') or export_path.endswith('.tgz'):
+    """Load GitLab export from tar.gz, an extracted export directory, or JSON."""
+    if os.path.isdir(export_path):
+        return load_dir_export(export_path)
+    elif export_path.endswith('.tar.gz') or export_path.endswith('.tgz'):
         return load_tar_export(export_path)
     else:
-        return load_json(export_path)
+        return load_json_collections(export_path, EXPORT_COLLECTIONS)
 
 
-def load_tar_export(tar_path: str) -> Dict[str, Any]:
-    """Load and parse GitLab tar.gz export."""
-    data = {
+def empty_export() -> Dict[str, Any]:
+    """Return an empty export structure for the archive loaders to fill."""
+    return {
         'user': {},
         'users': [],
         'projects': [],
@@ -61,309 +81,358 @@ def load_tar_export(tar_path: str) -> Dict[str, Any]:
         'events': [],
     }
 
-    with tarfile.open(tar_path, 'r:gz') as tf:
-        for member in tf.getmembers():
-            if not member.name.endswith('.json'):
+
+def add_export_content(data: Dict[str, Any], name: str, content: Any) -> None:
+    """File a parsed export JSON member into the matching bucket of the export data."""
+    basename = os.path.basename(name).lower()
+
+    if 'user' in basename:
+        if isinstance(content, dict):
+            data['user'] = content
+            data['users'].append(content)
+        elif isinstance(content, list):
+            data['users'].extend(content)
+
+    elif 'project' in basename:
+        if isinstance(content, list):
+            data['projects'].extend(content)
+        elif isinstance(content, dict):
+            data['projects'].append(content)
+
+    elif 'issue' in basename:
+        if isinstance(content, list):
+            data['issues'].extend(content)
+
+    elif 'merge' in basename or 'mr' in basename:
+        if isinstance(content, list):
+            data['merge_requests'].extend(content)
+
+    elif 'comment' in basename or 'note' in basename:
+        if isinstance(content, list):
+            data['comments'].extend(content)
+
+    elif 'snippet' in basename:
+        if isinstance(content, list):
+            data['snippets'].extend(content)
+
+    elif 'event' in basename or 'activity' in basename:
+        if isinstance(content, list):
+            data['events'].extend(content)
+
+
+def load_tar_export(tar_path: str) -> Dict[str, Any]:
+    """Load and parse GitLab tar.gz export."""
+    data = empty_export()
+
+    # Stream mode: a single forward pass, members are read as they arrive
+    with tarfile.open(tar_path, 'r|gz') as tf:
+        for member in tf:
+            if not member.isfile() or not member.name.endswith('.json'):
+                continue
+
+            try:
+                f = tf.extractfile(member)
+                if f:
+                    add_export_content(data, member.name, json_loads(f.read()))
+            except (json.JSONDecodeError, UnicodeDecodeError):
                 continue
 
+    return data
+
+
+def load_dir_export(dir_path: str) -> Dict[str, Any]:
+    """Load a GitLab export that has already been extracted to a directory.
+
+    Repeat runs against an extracted export skip gzip decompression and the
+    tar stream entirely; member files are read straight from disk.
+    """
+    data = empty_export()
+
+    pending = [dir_path]
+    while pending:
+        with os.scandir(pending.pop()) as it:
+            # Sorted so the result does not depend on directory listing order
+            entries = sorted(it, key=lambda e: e.name)
+        for entry in reversed(entries):
+            if entry.is_dir():
+                pending.append(entry.path)
+        for entry in entries:
+            if not entry.is_file() or not entry.name.endswith('.json'):
+                continue
             try:
-                    f = tf.extractfile(member)
-                    if f:
-                        content = json.loads(f.read().decode('utf-8'))
-                        basename = os.path.basename(member.name).lower()
-
-                        if 'user' in basename:
-                            if isinstance(content, dict):
-                                data['user'] = content
-                                data['users'].append(content)
-                            elif isinstance(content, list):
-                                data['users'].extend(content)
-
-                        elif 'project' in basename:
-                            if isinstance(content, list):
-                                data['projects'].extend(content)
-                            elif isinstance(content, dict):
-                                data['projects'].append(content)
-
-                        elif 'issue' in basename:
-                            if isinstance(content, list):
-                                data['issues'].extend(content)
-
-                        elif 'merge' in basename or 'mr' in basename:
-                            if isinstance(content, list):
-                                data['merge_requests'].extend(content)
-
-                        elif 'comment' in basename or 'note' in basename:
-                            if isinstance(content, list):
-                                data['comments'].extend(content)
-
-                        elif 'snippet' in basename:
-                            if isinstance(content, list):
-                                data['snippets'].extend(content)
-
-                        elif 'event' in basename or 'activity' in basename:
-                            if isinstance(content, list):
-                                data['events'].extend(content)
-
-                except (json.JSONDecodeError, UnicodeDecodeError):
-                    continue
-
-        return data
-
-
-    def find_data_subject(
-        data: Dict[str, Any],
-        name: str,
-        email: str = None
-    ) -> Optional[Dict]:
-        """Find the data subject in GitLab users."""
-        # Check main user first
-        user = data.get('user', {})
-        if user:
-            user_email = (user.get('email') or user.get('public_email') or '').lower()
-            user_name = (user.get('name') or user.get('username') or '').lower()
-            name_lower = name.lower()
-
-            if (email and user_email == email.lower()) or name_lower in user_name or user_name in name_lower:
-                return {
-                    'id': user.get('id'),
-                    'name': user.get('name') or user.get('username'),
-                    'email': user.get('email') or user.get('public_email'),
-                    'username': user.get('username'),
-                    'raw': user,
-                }
-
-        # Check users list
-        users = data.get('users', [])
-        matches = []
-        name_lower = name.lower()
-
-        for user in users:
-            user_email = (user.get('email') or user.get('public_email') or '').lower()
-            user_name = (user.get('name') or user.get('username') or '').lower()
-
-            is_match = False
-            if email and user_email == email.lower():
-                is_match = True
-            elif name_lower in user_name or user_name in name_lower:
-                is_match = True
-
-            if is_match:
-                matches.append({
-                    'id': user.get('id'),
-                    'name': user.get('name') or user.get('username'),
-                    'email': user.get('email') or user.get('public_email'),
-                    'username': user.get('username'),
-                    'raw': user,
-                })
-
-        return validate_data_subject_match(matches, name, email)
-
-
-    def extract_users(data: Dict[str, Any]) -> Dict[str, Dict]:
-        """Extract all users for redaction mapping."""
-        users = {}
-
-        for user in data.get('users', []):
-            user_id = str(user.get('id', ''))
-            if user_id:
-                users[user_id] = {
-                    'name': user.get('name') or user.get('username'),
-                    'email': user.get('email') or user.get('public_email'),
-                }
-                if user.get('username'):
-                    users[user['username']] = users[user_id]
-
-        # Extract from issues/MRs
-        for issue in data.get('issues', []):
-            author = issue.get('author', {})
-            if author.get('id'):
-                users[str(author['id'])] = {
-                    'name': author.get('name') or author.get('username'),
-                    'email': author.get('email'),
-                }
-
-        for mr in data.get('merge_requests', []):
-            author = mr.get('author', {})
-            if author.get('id'):
-                users[str(author['id'])] = {
-                    'name': author.get('name') or author.get('username'),
-                    'email': author.get('email'),
-                }
-
-        return users
-
-
-    def extract_profile(data_subject: Dict) -> Dict[str, Any]:
-        """Extract profile data for the data subject."""
-        raw = data_subject.get('raw', {})
+                with open(entry.path, 'rb') as f:
+                    add_export_content(data, entry.name, json_loads(f.read()))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+
+    return data
+
+
+def find_data_subject(
+    data: Dict[str, Any],
+    name: str,
+    email: str = None
+) -> Optional[Dict]:
+    """Find the data subject in GitLab users."""
+    name_lower = name.lower()
+    email_lower = email.lower() if email else None
+
+    def email_of(user: Dict) -> str:
+        return (user.get('email') or user.get('public_email') or '').lower()
 
+    def name_matches(user: Dict) -> bool:
+        user_name = (user.get('name') or user.get('username') or '').lower()
+        return bool(user_name) and (name_lower in user_name or user_name in name_lower)
+
+    def to_subject(user: Dict) -> Dict:
         return {
-            'User ID': raw.get('id'),
-            'Username': raw.get('username'),
-            'Name': raw.get('name'),
-            'Email': raw.get('email'),
-            'Public Email': raw.get('public_email'),
-            'Commit Email': raw.get('commit_email'),
-            'State': raw.get('state'),
-            'Admin': raw.get('is_admin'),
-            'External': raw.get('external'),
-            'Bio': raw.get('bio'),
-            'Location': raw.get('location'),
-            'Skype': raw.get('skype'),
-            'LinkedIn': raw.get('linkedin'),
-            'Twitter': raw.get('twitter'),
-            'Website URL': raw.get('website_url'),
-            'Organization': raw.get('organization'),
-            'Job Title': raw.get('job_title'),
-            'Work Information': raw.get('work_information'),
-            'Avatar URL': raw.get('avatar_url'),
-            'Web URL': raw.get('web_url'),
-            'Created At': format_date(raw.get('created_at')),
-            'Last Sign In': format_date(raw.get('last_sign_in_at')),
-            'Current Sign In': format_date(raw.get('current_sign_in_at')),
-            'Last Activity': format_date(raw.get('last_activity_on')),
-            'Two Factor Enabled': raw.get('two_factor_enabled'),
-            'Projects Limit': raw.get('projects_limit'),
-            'Can Create Group': raw.get('can_create_group'),
-            'Can Create Project': raw.get('can_create_project'),
-            'Theme ID': raw.get('theme_id'),
-            'Color Scheme': raw.get('color_scheme_id'),
+            'id': user.get('id'),
+            'name': user.get('name') or user.get('username'),
+            'email': user.get('email') or user.get('public_email'),
+            'username': user.get('username'),
+            'raw': user,
         }
 
+    # Check main user first
+    user = data.get('user', {})
+    if user and ((email_lower and email_of(user) == email_lower) or name_matches(user)):
+        return to_subject(user)
+
+    users = data.get('users', [])
+
+    # A unique exact email match identifies the subject outright; users
+    # sharing the email stay candidates so validation reports the ambiguity
+    email_hits = set()
+    if email_lower:
+        email_hits = {i for i, user in enumerate(users) if email_of(user) == email_lower}
+        if len(email_hits) == 1:
+            return to_subject(users[next(iter(email_hits))])
+
+    names = [user.get('name') or user.get('username') for user in users]
+    hits = email_hits.union(find_name_matches(name, names))
+    matches = [to_subject(users[i]) for i in sorted(hits)]
+    return validate_data_subject_match(matches, name, email)
+
+
+def extract_users(data: Dict[str, Any]) -> Dict[str, Dict]:
+    """Extract all users for redaction mapping."""
+    users = {}
+
+    for user in data.get('users', []):
+        user_id = str(user.get('id', ''))
+        if user_id:
+            users[user_id] = {
+                'name': user.get('name') or user.get('username'),
+                'email': user.get('email') or user.get('public_email'),
+            }
+            if user.get('username'):
+                users[user['username']] = users[user_id]
+
+    # Extract from issues/MRs
+    for item in chain(data.get('issues', []), data.get('merge_requests', [])):
+        author = item.get('author', {})
+        if author.get('id'):
+            users[str(author['id'])] = {
+                'name': author.get('name') or author.get('username'),
+                'email': author.get('email'),
+            }
+
+    return users
+
+
+def extract_profile(data_subject: Dict) -> Dict[str, Any]:
+    """Extract profile data for the data subject."""
+    raw = data_subject.get('raw', {})
+
+    return {
+        'User ID': raw.get('id'),
+        'Username': raw.get('username'),
+        'Name': raw.get('name'),
+        'Email': raw.get('email'),
+        'Public Email': raw.get('public_email'),
+        'Commit Email': raw.get('commit_email'),
+        'State': raw.get('state'),
+        'Admin': raw.get('is_admin'),
+        'External': raw.get('external'),
+        'Bio': raw.get('bio'),
+        'Location': raw.get('location'),
+        'Skype': raw.get('skype'),
+        'LinkedIn': raw.get('linkedin'),
+        'Twitter': raw.get('twitter'),
+        'Website URL': raw.get('website_url'),
+        'Organization': raw.get('organization'),
+        'Job Title': raw.get('job_title'),
+        'Work Information': raw.get('work_information'),
+        'Avatar URL': raw.get('avatar_url'),
+        'Web URL': raw.get('web_url'),
+        'Created At': format_date(raw.get('created_at')),
+        'Last Sign In': format_date(raw.get('last_sign_in_at')),
+        'Current Sign In': format_date(raw.get('current_sign_in_at')),
+        'Last Activity': format_date(raw.get('last_activity_on')),
+        'Two Factor Enabled': raw.get('two_factor_enabled'),
+        'Projects Limit': raw.get('projects_limit'),
+        'Can Create Group': raw.get('can_create_group'),
+        'Can Create Project': raw.get('can_create_project'),
+        'Theme ID': raw.get('theme_id'),
+        'Color Scheme': raw.get('color_scheme_id'),
+    }
 
-    def extract_records(
-        data: Dict[str, Any],
-        data_subject: Dict
-    ) -> List[Dict]:
-        """Extract all projects, issues, MRs, and comments for the data subject."""
-        records = []
-        ds_id = str(data_subject.get('id', ''))
-        ds_username = (data_subject.get('username') or '').lower()
-
-        def is_user_match(user_obj: Dict) -> bool:
-            if not user_obj:
-                return False
-            user_id = str(user_obj.get('id', ''))
-            username = (user_obj.get('username') or '').lower()
-            return user_id == ds_id or username == ds_username
-
-        # Projects
-        for project in data.get('projects', []):
-            creator = project.get('creator', project.get('owner', {}))
-            if is_user_match(creator):
-                records.append({
-                    'date': format_date(project.get('created_at')),
-                    'type': 'project',
-                    'category': 'Projects',
-                    'content': f"Project: {project.get('name') or project.get('path')}\nPath: {project.get('path_with_namespace', project.get('path'))}\nVisibility: {project.get('visibility', 'private')}\nDescription: {project.get('description', 'N/A')[:300]}",
-                })
-
-        # Issues
-        for issue in data.get('issues', []):
-            author = issue.get('author', {})
-            assignees = issue.get('assignees', [])
-            assignee_ids = [str(a.get('id', '')) for a in assignees]
-
-            if is_user_match(author) or ds_id in assignee_ids:
-                project_name = issue.get('project', {}).get('name', issue.get('project_id', 'Unknown'))
-
-                role = []
-                if is_user_match(author):
-                    role.append('author')
-                if ds_id in assignee_ids:
-                    role.append('assignee')
-
-                records.append({
-                    'date': format_date(issue.get('created_at')),
-                    'type': 'issue',
-                    'category': f"Issues / {project_name}",
-                    'content': f"Issue #{issue.get('iid', issue.get('id'))}: {issue.get('title')}\nRole: {', '.join(role)}\nState: {issue.get('state')}\nLabels: {', '.join(issue.get('labels', []))}\nDescription: {strip_html(issue.get('description', '') or '')[:400]}",
-                })
-
-        # Merge Requests
-        for mr in data.get('merge_requests', []):
-            author = mr.get('author', {})
-            assignees = mr.get('assignees', [])
-            assignee_ids = [str(a.get('id', '')) for a in assignees]
-
-            if is_user_match(author) or ds_id in assignee_ids:
-                project_name = mr.get('project', {}).get('name', mr.get('project_id', 'Unknown'))
-
-                role = []
-                if is_user_match(author):
-                    role.append('author')
-                if ds_id in assignee_ids:
-                    role.append('assignee')
-
-                records.append({
-                    'date': format_date(mr.get('created_at')),
-                    'type': 'merge_request',
-                    'category': f"Merge Requests / {project_name}",
-                    'content': f"MR !{mr.get('iid', mr.get('id'))}: {mr.get('title')}\nRole: {', '.join(role)}\nState: {mr.get('state')}\nSource: {mr.get('source_branch')} → {mr.get('target_branch')}\nDescription: {strip_html(mr.get('description', '') or '')[:400]}",
-                })
-
-        # Comments/Notes
-        for comment in data.get('comments', data.get('notes', [])):
-            author = comment.get('author', {})
-            if is_user_match(author):
-                records.append({
-                    'date': format_date(comment.get('created_at')),
-                    'type': 'comment',
-                    'category': f"Comments / {comment.get('noteable_type', 'Item')}",
-                    'content': strip_html(comment.get('body', '')),
-                })
-
-        # Snippets
-        for snippet in data.get('snippets', []):
-            author = snippet.get('author', {})
-            if is_user_match(author):
-                records.append({
-                    'date': format_date(snippet.get('created_at')),
-                    'type': 'snippet',
-                    'category': 'Snippets',
-                    'content': f"Snippet: {snippet.get('title')}\nVisibility: {snippet.get('visibility', 'private')}\nFilename: {snippet.get('file_name', 'N/A')}",
-                })
-
-        # Events/Activity
-        for event in data.get('events', []):
-            author = event.get('author', {})
-            if is_user_match(author) or str(event.get('author_id', '')) == ds_id:
-                records.append({
-                    'date': format_date(event.get('created_at')),
-                    'type': event.get('action_name', 'event'),
-                    'category': 'Activity',
-                    'content': f"Action: {event.get('action_name', 'unknown')}\nTarget: {event.get('target_type', 'N/A')} - {event.get('target_title', 'N/A')}",
-                })
-
-        # Sort by date
-        records.sort(key=lambda r: r.get('date', ''), reverse=True)
-        return records
-
-
-    def process(
-        export_path: str,
-        data_subject_name: str,
-        data_subject_email: str = None,
-        extra_redactions: List[str] = None,
-        output_dir: str = './output'
-    ) -> tuple:
-        """Process a GitLab export for DSAR response."""
-        start_time = time.time()
-
-        ensure_output_dir(output_dir)
-        ensure_output_dir(os.path.join(output_dir, 'internal'))
 
-        log_event(
-            'processing_started',
-            output_dir=output_dir,
-            vendor=VENDOR_NAME,
-            data_subject_name=data_subject_name,
-            data_subject_email=data_subject_email,
-            export_file=os.path.basename(export_path),
+def _project_records(projects: List[Dict], is_user_match: Callable) -> Iterator[Dict]:
+    """Yield project records created by the data subject."""
+    for project in projects:
+        creator = project.get('creator', project.get('owner', {}))
+        if is_user_match(creator):
+            yield {
+                'date': format_date(project.get('created_at')),
+                'type': 'project',
+                'category': 'Projects',
+                'content': f"Project: {project.get('name') or project.get('path')}\nPath: {project.get('path_with_namespace', project.get('path'))}\nVisibility: {project.get('visibility', 'private')}\nDescription: {project.get('description', 'N/A')[:300]}",
+            }
+
+
+# Role line for issues/MRs, keyed on (is_author, is_assignee)
+ROLE_LABELS = {
+    (True, False): 'author',
+    (False, True): 'assignee',
+    (True, True): 'author, assignee',
+}
+
+
+def _issue_records(issues: List[Dict], is_user_match: Callable, ds_id: str) -> Iterator[Dict]:
+    """Yield issue records the data subject authored or is assigned to."""
+    for issue in issues:
+        author = issue.get('author', {})
+        is_author = is_user_match(author)
+        is_assignee = any(str(a.get('id', '')) == ds_id for a in issue.get('assignees', []))
+
+        if is_author or is_assignee:
+            project_name = issue.get('project', {}).get('name', issue.get('project_id', 'Unknown'))
+
+            yield {
+                'date': format_date(issue.get('created_at')),
+                'type': 'issue',
+                'category': f"Issues / {project_name}",
+                'content': f"Issue #{issue.get('iid', issue.get('id'))}: {issue.get('title')}\nRole: {ROLE_LABELS[is_author, is_assignee]}\nState: {issue.get('state')}\nLabels: {', '.join(issue.get('labels', []))}\nDescription: {strip_html(issue.get('description', '') or '', 400)}",
+            }
+
+
+def _merge_request_records(merge_requests: List[Dict], is_user_match: Callable, ds_id: str) -> Iterator[Dict]:
+    """Yield merge request records the data subject authored or is assigned to."""
+    for mr in merge_requests:
+        author = mr.get('author', {})
+        is_author = is_user_match(author)
+        is_assignee = any(str(a.get('id', '')) == ds_id for a in mr.get('assignees', []))
+
+        if is_author or is_assignee:
+            project_name = mr.get('project', {}).get('name', mr.get('project_id', 'Unknown'))
+
+            yield {
+                'date': format_date(mr.get('created_at')),
+                'type': 'merge_request',
+                'category': f"Merge Requests / {project_name}",
+                'content': f"MR !{mr.get('iid', mr.get('id'))}: {mr.get('title')}\nRole: {ROLE_LABELS[is_author, is_assignee]}\nState: {mr.get('state')}\nSource: {mr.get('source_branch')} → {mr.get('target_branch')}\nDescription: {strip_html(mr.get('description', '') or '', 400)}",
+            }
+
+
+def _comment_records(comments: List[Dict], is_user_match: Callable) -> Iterator[Dict]:
+    """Yield comment/note records written by the data subject."""
+    for comment in comments:
+        author = comment.get('author', {})
+        if is_user_match(author):
+            yield {
+                'date': format_date(comment.get('created_at')),
+                'type': 'comment',
+                'category': f"Comments / {comment.get('noteable_type', 'Item')}",
+                'content': strip_html(comment.get('body', '')),
+            }
+
+
+def _snippet_records(snippets: List[Dict], is_user_match: Callable) -> Iterator[Dict]:
+    """Yield snippet records authored by the data subject."""
+    for snippet in snippets:
+        author = snippet.get('author', {})
+        if is_user_match(author):
+            yield {
+                'date': format_date(snippet.get('created_at')),
+                'type': 'snippet',
+                'category': 'Snippets',
+                'content': f"Snippet: {snippet.get('title')}\nVisibility: {snippet.get('visibility', 'private')}\nFilename: {snippet.get('file_name', 'N/A')}",
+            }
+
+
+def _event_records(events: List[Dict], is_user_match: Callable, ds_id: str) -> Iterator[Dict]:
+    """Yield activity events performed by the data subject."""
+    for event in events:
+        author = event.get('author', {})
+        if is_user_match(author) or str(event.get('author_id', '')) == ds_id:
+            yield {
+                'date': format_date(event.get('created_at')),
+                'type': event.get('action_name', 'event'),
+                'category': 'Activity',
+                'content': f"Action: {event.get('action_name', 'unknown')}\nTarget: {event.get('target_type', 'N/A')} - {event.get('target_title', 'N/A')}",
+            }
+
+
+def extract_records(
+    data: Dict[str, Any],
+    data_subject: Dict
+) -> List[Dict]:
+    """Extract all projects, issues, MRs, and comments for the data subject."""
+    ds_id = str(data_subject.get('id', ''))
+    ds_username = (data_subject.get('username') or '').lower()
+
+    # Export ids are usually ints, so the int form is included to look up
+    # the raw value without coercing every author id to a string; other id
+    # types fall back to a string comparison. Blank subject fields never match.
+    match_ids = id_lookup_keys(ds_id)
+
+    def is_user_match(user_obj: Dict) -> bool:
+        if not user_obj:
+            return False
+        return bool(
+            (ds_id and user_obj.get('id') in match_ids)
+            or (ds_username and (user_obj.get('username') or '').lower() == ds_username)
         )
 
-        try:
+    # Each source is filtered and formatted lazily; one list is built by the sort
+    return sorted(
+        chain(
+            _project_records(data.get('projects', []), is_user_match),
+            _issue_records(data.get('issues', []), is_user_match, ds_id),
+            _merge_request_records(data.get('merge_requests', []), is_user_match, ds_id),
+            _comment_records(data.get('comments', data.get('notes', [])), is_user_match),
+            _snippet_records(data.get('snippets', []), is_user_match),
+            _event_records(data.get('events', []), is_user_match, ds_id),
+        ),
+        key=itemgetter('date'),
+        reverse=True
+    )
+
+
+def process(
+    export_path: str,
+    data_subject_name: str,
+    data_subject_email: str = None,
+    extra_redactions: List[str] = None,
+    output_dir: str = './output'
+) -> tuple:
+    """Process a GitLab export for DSAR response."""
+    start_time = time.time()
+
+    ensure_output_dir(output_dir)
+    ensure_output_dir(os.path.join(output_dir, 'internal'))
+
+    log_event(
+        'processing_started',
+        output_dir=output_dir,
+        vendor=VENDOR_NAME,
+        data_subject_name=data_subject_name,
+        data_subject_email=data_subject_email,
+        export_file=os.path.basename(export_path),
+    )
+
+    try:
         print(f"Loading GitLab export from {export_path}...")
         data = load_export(export_path)
 
@@ -389,13 +458,17 @@ def load_tar_export(tar_path: str) -> Dict[str, Any]:
         records = extract_records(data, data_subject)
         print(f"  Found {len(records)} records for data subject")
 
+        # Everything needed from the export has been extracted; release it
+        # so the parsed export is not held while the reports are built
+        del data, users
+
         print("Applying redactions...")
-        redacted_records = []
-        for record in records:
-            redacted = record.copy()
-            if 'content' in redacted:
-                redacted['content'] = engine.redact(str(redacted['content']))
-            redacted_records.append(redacted)
+        # Records are built locally and not reused, so redact them in place
+        contents = engine.redact_many(str(record['content']) for record in records)
+        for record, content in zip(records, contents):
+            record['content'] = content
+        del contents
+        redacted_records = records
 
         safe_name = safe_filename(data_subject_name)
         timestamp = get_timestamp()
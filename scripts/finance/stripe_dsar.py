@@ -14,6 +14,7 @@ import sys
 import os
 import time
 from datetime import datetime
+from operator import itemgetter
 from typing import Dict, List, Any, Optional
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,18 +24,31 @@ from core.docgen import create_vendor_report
 from core.utils import (
     setup_argparser,
     parse_extra_redactions,
-    load_json,
+    load_json_collections,
     save_json,
     ensure_output_dir,
     safe_filename,
     format_date,
     get_timestamp,
     validate_data_subject_match,
+    find_name_matches,
 )
 from core.activity_log import log_event
 
 VENDOR_NAME = "Stripe"
 
+# Top-level collections read from the export; anything else is skipped
+# while streaming so large account exports stay bounded
+EXPORT_COLLECTIONS = (
+    'customers', 'data',
+    'charges',
+    'invoices',
+    'subscriptions',
+    'payment_intents',
+    'refunds',
+    'disputes',
+)
+
 
 def find_data_subject(
     data: Dict[str, Any],
@@ -43,27 +57,30 @@ def find_data_subject(
 ) -> Optional[Dict]:
     """Find the data subject in Stripe customers."""
     customers = data.get('customers', data.get('data', []))
-    matches = []
-    name_lower = name.lower()
-
-    for customer in customers:
-        customer_email = (customer.get('email') or '').lower()
-        customer_name = (customer.get('name') or '').lower()
-
-        is_match = False
-        if email and customer_email == email.lower():
-            is_match = True
-        elif name_lower in customer_name or customer_name in name_lower:
-            is_match = True
-
-        if is_match:
-            matches.append({
-                'id': customer.get('id'),
-                'name': customer.get('name') or customer.get('email'),
-                'email': customer.get('email'),
-                'raw': customer,
-            })
 
+    def to_subject(customer: Dict) -> Dict:
+        return {
+            'id': customer.get('id'),
+            'name': customer.get('name') or customer.get('email'),
+            'email': customer.get('email'),
+            'raw': customer,
+        }
+
+    # A unique exact email match identifies the subject outright; customers
+    # sharing the email stay candidates so validation reports the ambiguity
+    email_hits = set()
+    if email:
+        email_lower = email.lower()
+        email_hits = {
+            i for i, customer in enumerate(customers)
+            if (customer.get('email') or '').lower() == email_lower
+        }
+        if len(email_hits) == 1:
+            return to_subject(customers[next(iter(email_hits))])
+
+    names = [customer.get('name') for customer in customers]
+    hits = email_hits.union(find_name_matches(name, names))
+    matches = [to_subject(customers[i]) for i in sorted(hits)]
     return validate_data_subject_match(matches, name, email)
 
 
@@ -124,135 +141,142 @@ def format_amount(amount: Any, currency: str = 'usd') -> str:
     if amount is None:
         return 'N/A'
     try:
-            return f"{currency.upper()} {int(amount) / 100:.2f}"
-        except (ValueError, TypeError):
-            return str(amount)
-
-
-    def extract_records(
-        data: Dict[str, Any],
-        data_subject_id: str,
-        data_subject_email: str = None
-    ) -> List[Dict]:
-        """Extract all charges, invoices, and subscriptions for the data subject."""
-        records = []
-        ds_id = str(data_subject_id)
-        ds_email_lower = (data_subject_email or '').lower()
-
-        # Charges
-        for charge in data.get('charges', []):
-            customer_id = str(charge.get('customer', ''))
-            receipt_email = (charge.get('receipt_email') or '').lower()
-
-            if customer_id == ds_id or receipt_email == ds_email_lower:
-                records.append({
-                    'date': format_date(charge.get('created')),
-                    'type': 'charge',
-                    'category': 'Payments',
-                    'content': f"Charge ID: {charge.get('id')}\nAmount: {format_amount(charge.get('amount'), charge.get('currency', 'usd'))}\nStatus: {charge.get('status')}\nDescription: {charge.get('description', 'N/A')}\nPayment Method: **** {charge.get('payment_method_details', {}).get('card', {}).get('last4', '****')}\nReceipt: {charge.get('receipt_url', 'N/A')}",
-                })
-
-        # Invoices
-        for invoice in data.get('invoices', []):
-            customer_id = str(invoice.get('customer', ''))
-            customer_email = (invoice.get('customer_email') or '').lower()
-
-            if customer_id == ds_id or customer_email == ds_email_lower:
-                # Extract line items
-                lines = invoice.get('lines', {}).get('data', [])
-                line_items = '\n'.join([f"  - {l.get('description', 'Item')}: {format_amount(l.get('amount'), invoice.get('currency', 'usd'))}" for l in lines[:5]])
-
-                records.append({
-                    'date': format_date(invoice.get('created')),
-                    'type': 'invoice',
-                    'category': 'Invoices',
-                    'content': f"Invoice #{invoice.get('number', invoice.get('id'))}\nAmount Due: {format_amount(invoice.get('amount_due'), invoice.get('currency', 'usd'))}\nAmount Paid: {format_amount(invoice.get('amount_paid'), invoice.get('currency', 'usd'))}\nStatus: {invoice.get('status')}\nItems:\n{line_items}\nPDF: {invoice.get('invoice_pdf', 'N/A')}",
-                })
-
-        # Subscriptions
-        for sub in data.get('subscriptions', []):
-            customer_id = str(sub.get('customer', ''))
-
-            if customer_id == ds_id:
-                items = sub.get('items', {}).get('data', [])
-                plan_names = ', '.join([i.get('plan', {}).get('nickname', i.get('price', {}).get('nickname', 'Plan')) or 'Plan' for i in items])
-
-                records.append({
-                    'date': format_date(sub.get('created')),
-                    'type': 'subscription',
-                    'category': 'Subscriptions',
-                    'content': f"Subscription ID: {sub.get('id')}\nStatus: {sub.get('status')}\nPlans: {plan_names}\nCurrent Period: {format_date(sub.get('current_period_start'))} to {format_date(sub.get('current_period_end'))}\nCancel At Period End: {sub.get('cancel_at_period_end')}",
-                })
-
-        # Payment Intents
-        for intent in data.get('payment_intents', []):
-            customer_id = str(intent.get('customer', ''))
-
-            if customer_id == ds_id:
-                records.append({
-                    'date': format_date(intent.get('created')),
-                    'type': 'payment_intent',
-                    'category': 'Payments',
-                    'content': f"Payment Intent: {intent.get('id')}\nAmount: {format_amount(intent.get('amount'), intent.get('currency', 'usd'))}\nStatus: {intent.get('status')}\nDescription: {intent.get('description', 'N/A')}",
-                })
-
-        # Refunds
-        for refund in data.get('refunds', []):
-            # Find if this refund is for a charge belonging to the customer
-            charge_id = refund.get('charge')
-            charge = next((c for c in data.get('charges', []) if c.get('id') == charge_id), None)
-
-            if charge and str(charge.get('customer', '')) == ds_id:
-                records.append({
-                    'date': format_date(refund.get('created')),
-                    'type': 'refund',
-                    'category': 'Refunds',
-                    'content': f"Refund ID: {refund.get('id')}\nAmount: {format_amount(refund.get('amount'), refund.get('currency', 'usd'))}\nStatus: {refund.get('status')}\nReason: {refund.get('reason', 'N/A')}\nOriginal Charge: {charge_id}",
-                })
-
-        # Disputes
-        for dispute in data.get('disputes', []):
-            charge_id = dispute.get('charge')
-            charge = next((c for c in data.get('charges', []) if c.get('id') == charge_id), None)
-
-            if charge and str(charge.get('customer', '')) == ds_id:
-                records.append({
-                    'date': format_date(dispute.get('created')),
-                    'type': 'dispute',
-                    'category': 'Disputes',
-                    'content': f"Dispute ID: {dispute.get('id')}\nAmount: {format_amount(dispute.get('amount'), dispute.get('currency', 'usd'))}\nStatus: {dispute.get('status')}\nReason: {dispute.get('reason', 'N/A')}",
-                })
-
-        # Sort by date
-        records.sort(key=lambda r: r.get('date', ''), reverse=True)
-        return records
-
-
-    def process(
-        export_path: str,
-        data_subject_name: str,
-        data_subject_email: str = None,
-        extra_redactions: List[str] = None,
-        output_dir: str = './output'
-    ) -> tuple:
-        """Process a Stripe export for DSAR response."""
-        start_time = time.time()
-
-        ensure_output_dir(output_dir)
-        ensure_output_dir(os.path.join(output_dir, 'internal'))
+        return f"{currency.upper()} {int(amount) / 100:.2f}"
+    except (ValueError, TypeError):
+        return str(amount)
 
-        log_event(
-            'processing_started',
-            output_dir=output_dir,
-            vendor=VENDOR_NAME,
-            data_subject_name=data_subject_name,
-            data_subject_email=data_subject_email,
-            export_file=os.path.basename(export_path),
-        )
 
-        try:
+def extract_records(
+    data: Dict[str, Any],
+    data_subject_id: str,
+    data_subject_email: str = None
+) -> List[Dict]:
+    """Extract all charges, invoices, and subscriptions for the data subject."""
+    records = []
+    ds_id = str(data_subject_id)
+    ds_email_lower = (data_subject_email or '').lower()
+
+    # Charges owned by the data subject, so refunds/disputes match in O(1)
+    ds_charge_ids = {
+        c['id'] for c in data.get('charges', [])
+        if c.get('id') and str(c.get('customer', '')) == ds_id
+    }
+
+    # Charges
+    for charge in data.get('charges', []):
+        customer_id = str(charge.get('customer', ''))
+        receipt_email = (charge.get('receipt_email') or '').lower()
+
+        if customer_id == ds_id or receipt_email == ds_email_lower:
+            records.append({
+                'date': format_date(charge.get('created')),
+                'type': 'charge',
+                'category': 'Payments',
+                'content': f"Charge ID: {charge.get('id')}\nAmount: {format_amount(charge.get('amount'), charge.get('currency', 'usd'))}\nStatus: {charge.get('status')}\nDescription: {charge.get('description', 'N/A')}\nPayment Method: **** {charge.get('payment_method_details', {}).get('card', {}).get('last4', '****')}\nReceipt: {charge.get('receipt_url', 'N/A')}",
+            })
+
+    # Invoices
+    for invoice in data.get('invoices', []):
+        customer_id = str(invoice.get('customer', ''))
+        customer_email = (invoice.get('customer_email') or '').lower()
+
+        if customer_id == ds_id or customer_email == ds_email_lower:
+            # Extract line items
+            lines = invoice.get('lines', {}).get('data', [])
+            line_items = '\n'.join([f"  - {l.get('description', 'Item')}: {format_amount(l.get('amount'), invoice.get('currency', 'usd'))}" for l in lines[:5]])
+
+            records.append({
+                'date': format_date(invoice.get('created')),
+                'type': 'invoice',
+                'category': 'Invoices',
+                'content': f"Invoice #{invoice.get('number', invoice.get('id'))}\nAmount Due: {format_amount(invoice.get('amount_due'), invoice.get('currency', 'usd'))}\nAmount Paid: {format_amount(invoice.get('amount_paid'), invoice.get('currency', 'usd'))}\nStatus: {invoice.get('status')}\nItems:\n{line_items}\nPDF: {invoice.get('invoice_pdf', 'N/A')}",
+            })
+
+    # Subscriptions
+    for sub in data.get('subscriptions', []):
+        customer_id = str(sub.get('customer', ''))
+
+        if customer_id == ds_id:
+            items = sub.get('items', {}).get('data', [])
+            plan_names = ', '.join([i.get('plan', {}).get('nickname', i.get('price', {}).get('nickname', 'Plan')) or 'Plan' for i in items])
+
+            records.append({
+                'date': format_date(sub.get('created')),
+                'type': 'subscription',
+                'category': 'Subscriptions',
+                'content': f"Subscription ID: {sub.get('id')}\nStatus: {sub.get('status')}\nPlans: {plan_names}\nCurrent Period: {format_date(sub.get('current_period_start'))} to {format_date(sub.get('current_period_end'))}\nCancel At Period End: {sub.get('cancel_at_period_end')}",
+            })
+
+    # Payment Intents
+    for intent in data.get('payment_intents', []):
+        customer_id = str(intent.get('customer', ''))
+
+        if customer_id == ds_id:
+            records.append({
+                'date': format_date(intent.get('created')),
+                'type': 'payment_intent',
+                'category': 'Payments',
+                'content': f"Payment Intent: {intent.get('id')}\nAmount: {format_amount(intent.get('amount'), intent.get('currency', 'usd'))}\nStatus: {intent.get('status')}\nDescription: {intent.get('description', 'N/A')}",
+            })
+
+    # Refunds
+    for refund in data.get('refunds', []):
+        # Include refunds for charges belonging to the customer; expanded
+        # exports carry the charge object rather than its id
+        charge = refund.get('charge')
+        charge_id = charge.get('id') if isinstance(charge, dict) else charge
+
+        if charge_id in ds_charge_ids:
+            records.append({
+                'date': format_date(refund.get('created')),
+                'type': 'refund',
+                'category': 'Refunds',
+                'content': f"Refund ID: {refund.get('id')}\nAmount: {format_amount(refund.get('amount'), refund.get('currency', 'usd'))}\nStatus: {refund.get('status')}\nReason: {refund.get('reason', 'N/A')}\nOriginal Charge: {charge_id}",
+            })
+
+    # Disputes
+    for dispute in data.get('disputes', []):
+        charge = dispute.get('charge')
+        charge_id = charge.get('id') if isinstance(charge, dict) else charge
+
+        if charge_id in ds_charge_ids:
+            records.append({
+                'date': format_date(dispute.get('created')),
+                'type': 'dispute',
+                'category': 'Disputes',
+                'content': f"Dispute ID: {dispute.get('id')}\nAmount: {format_amount(dispute.get('amount'), dispute.get('currency', 'usd'))}\nStatus: {dispute.get('status')}\nReason: {dispute.get('reason', 'N/A')}",
+            })
+
+    # Sort by date
+    records.sort(key=itemgetter('date'), reverse=True)
+    return records
+
+
+def process(
+    export_path: str,
+    data_subject_name: str,
+    data_subject_email: str = None,
+    extra_redactions: List[str] = None,
+    output_dir: str = './output'
+) -> tuple:
+    """Process a Stripe export for DSAR response."""
+    start_time = time.time()
+
+    ensure_output_dir(output_dir)
+    ensure_output_dir(os.path.join(output_dir, 'internal'))
+
+    log_event(
+        'processing_started',
+        output_dir=output_dir,
+        vendor=VENDOR_NAME,
+        data_subject_name=data_subject_name,
+        data_subject_email=data_subject_email,
+        export_file=os.path.basename(export_path),
+    )
+
+    try:
         print(f"Loading Stripe export from {export_path}...")
-        data = load_json(export_path)
+        data = load_json_collections(export_path, EXPORT_COLLECTIONS)
 
         print(f"Searching for data subject: {data_subject_name}...")
         data_subject = find_data_subject(data, data_subject_name, data_subject_email)
@@ -277,13 +301,17 @@ def format_amount(amount: Any, currency: str = 'usd') -> str:
         records = extract_records(data, ds_id, data_subject_email)
         print(f"  Found {len(records)} records for data subject")
 
+        # Everything needed from the export has been extracted; release it
+        # so the parsed export is not held while the reports are built
+        del data, users
+
         print("Applying redactions...")
-        redacted_records = []
-        for record in records:
-            redacted = record.copy()
-            if 'content' in redacted:
-                redacted['content'] = engine.redact(str(redacted['content']))
-            redacted_records.append(redacted)
+        # Records are built locally and not reused, so redact them in place
+        contents = engine.redact_many(str(record['content']) for record in records)
+        for record, content in zip(records, contents):
+            record['content'] = content
+        del contents
+        redacted_records = records
 
         safe_name = safe_filename(data_subject_name)
         timestamp = get_timestamp()
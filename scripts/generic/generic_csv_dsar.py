@@ -15,20 +15,23 @@ import os
 import argparse
 import time
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from itertools import islice
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.redaction import RedactionEngine
 from core.docgen import create_vendor_report
 from core.utils import (
-    load_csv,
+    detect_csv_encoding,
+    iter_csv_rows,
     save_json,
     ensure_output_dir,
     safe_filename,
     format_date,
     get_timestamp,
     strip_html,
+    find_name_matches,
 )
 from core.activity_log import log_event
 
@@ -62,9 +65,23 @@ DATE_COLUMNS = [
 ]
 
 
-def detect_column(columns: List[str], candidates: List[str]) -> Optional[str]:
-    """Detect a column from a list of candidates."""
-    columns_lower = {c.lower().strip(): c for c in columns}
+def lower_columns(columns: List[str]) -> Dict[str, str]:
+    """Map normalised (lowercased, stripped) column names to the originals."""
+    return {c.lower().strip(): c for c in columns}
+
+
+def detect_column(
+    columns: List[str],
+    candidates: List[str],
+    columns_lower: Dict[str, str] = None
+) -> Optional[str]:
+    """Detect a column from a list of candidates.
+
+    Pass columns_lower (from lower_columns) when detecting several column
+    groups against the same header so it is only normalised once.
+    """
+    if columns_lower is None:
+        columns_lower = lower_columns(columns)
 
     for candidate in candidates:
         if candidate in columns_lower:
@@ -79,60 +96,154 @@ def detect_column(columns: List[str], candidates: List[str]) -> Optional[str]:
     return None
 
 
-def find_data_subject(
-    rows: List[Dict],
-    name: str,
-    email: str = None,
+def resolve_columns(
+    header: List[str],
     name_col: str = None,
     email_col: str = None
-) -> Optional[Dict]:
-    """Find the data subject in CSV rows."""
-    if not rows:
-        raise ValueError("CSV file is empty")
-
-    columns = list(rows[0].keys())
+) -> Dict[str, Any]:
+    """Detect the name/email/id/date columns once and resolve them to row positions."""
+    columns_lower = lower_columns(header)
 
-    # Detect columns if not specified
     if not name_col:
-        name_col = detect_column(columns, NAME_COLUMNS)
+        name_col = detect_column(header, NAME_COLUMNS, columns_lower)
     if not email_col:
-        email_col = detect_column(columns, EMAIL_COLUMNS)
-
-    id_col = detect_column(columns, ID_COLUMNS)
+        email_col = detect_column(header, EMAIL_COLUMNS, columns_lower)
 
     if not name_col and not email_col:
         raise ValueError(
             f"Could not auto-detect name or email columns. "
-            f"Available columns: {', '.join(columns)}. "
+            f"Available columns: {', '.join(header)}. "
             f"Use --name-col and --email-col to specify manually."
         )
 
+    # Last position wins for duplicate headers, as with csv.DictReader
+    positions = {column: i for i, column in enumerate(header)}
+
+    return {
+        'header': header,
+        'name_col': name_col,
+        'email_col': email_col,
+        'name': positions.get(name_col),
+        'email': positions.get(email_col),
+        'id': positions.get(detect_column(header, ID_COLUMNS, columns_lower)),
+        'date': positions.get(detect_column(header, DATE_COLUMNS, columns_lower)),
+    }
+
+
+def cell(row: List[str], index: Optional[int]) -> str:
+    """Return the value at a column position, or '' if the row has none."""
+    if index is None or index >= len(row):
+        return ''
+    return row[index]
+
+
+def row_to_dict(header: List[str], row: List[str]) -> Dict:
+    """Build the csv.DictReader-style dict for a row (only done for matched rows)."""
+    record = dict(zip(header, row))
+    if len(row) > len(header):
+        record[None] = row[len(header):]
+    elif len(row) < len(header):
+        for key in header[len(row):]:
+            record[key] = None
+    return record
+
+
+def empty_row_index() -> Dict[str, Any]:
+    """Return an empty row index for find_data_subject to fill."""
+    return {
+        'email': {},  # lowercased email -> row numbers
+        'id': {},     # id value -> row numbers
+        'names': {},  # lowercased name -> row numbers
+    }
+
+
+def find_data_subject(
+    rows: Iterable[List[str]],
+    columns: Dict[str, Any],
+    name: str,
+    email: str = None,
+    users: Optional[Dict[str, Tuple[str, str]]] = None,
+    index: Optional[Dict[str, Any]] = None
+) -> Optional[Dict]:
+    """Find the data subject in CSV rows.
+
+    If a users dict is given, every row with a name or email is added to it
+    as a (name, email) tuple for redaction mapping during the same pass.
+    If an index (from empty_row_index) is given, rows are indexed by name,
+    email and id so the subject's records can be located without re-testing
+    every row.
+    """
+    name_idx = columns['name']
+    email_idx = columns['email']
+    id_idx = columns['id']
+
     matches = []
     name_lower = name.lower()
+    email_lower = email.lower() if email else None
+    empty = True
+
+    # Hoisted out of the per-row loop below, which runs once per CSV row
+    intern = sys.intern
+    match_email = bool(email_lower) and email_idx is not None
+    match_name = name_idx is not None
+    if index is not None:
+        names_index = index['names']
+        email_index = index['email']
+        id_index = index['id'] if id_idx is not None else None
+    # Rows reaching both name and email columns (nearly all) are indexed directly
+    full_row = name_idx is not None and email_idx is not None
+    width = max(name_idx, email_idx) + 1 if full_row else 0
 
     for i, row in enumerate(rows):
-        row_email = (row.get(email_col, '') or '').lower().strip() if email_col else ''
-        row_name = (row.get(name_col, '') or '').lower().strip() if name_col else ''
-
-        is_match = False
-        if email and email_col and row_email == email.lower():
-            is_match = True
-        elif name_col and (name_lower in row_name or row_name in name_lower):
-            is_match = True
-
-        if is_match:
+        empty = False
+        if full_row and len(row) >= width:
+            row_name = row[name_idx]
+            row_email = row[email_idx]
+        else:
+            row_name = cell(row, name_idx)
+            row_email = cell(row, email_idx)
+        row_id = cell(row, id_idx) if id_idx is not None else str(i)
+
+        if users is not None and (row_name or row_email):
+            # Interned, since exports often repeat the same people on many rows
+            users[row_id] = (intern(row_name), intern(row_email))
+
+        row_email_lower = row_email.lower().strip()
+        row_name_lower = row_name.lower().strip()
+
+        if index is not None:
+            names_index.setdefault(intern(row_name_lower), []).append(i)
+            if row_email_lower:
+                email_index.setdefault(row_email_lower, []).append(i)
+            if id_index is not None:
+                id_index.setdefault(row_id, []).append(i)
+
+        if matches and email:
+            # With an email the first match is returned, so later rows are
+            # only read for the users dict and index (if either was asked for)
+            if users is None and index is None:
+                break
+            continue
+
+        if (
+            (match_email and row_email_lower == email_lower)
+            or (match_name and (name_lower in row_name_lower or row_name_lower in name_lower))
+        ):
             matches.append({
-                'id': row.get(id_col, str(i)) if id_col else str(i),
-                'name': row.get(name_col, '') if name_col else '',
-                'email': row.get(email_col, '') if email_col else '',
-                'raw': row,
+                'id': row_id,
+                'name': row_name,
+                'email': row_email,
+                'raw': row_to_dict(columns['header'], row),
                 'row_index': i,
             })
 
+    if empty:
+        raise ValueError("CSV file is empty")
+
     if not matches:
         raise ValueError(
             f"Data subject '{name}' not found in CSV. "
-            f"Searched in columns: name={name_col}, email={email_col}"
+            f"Searched in columns: name={columns['name_col']}, email={columns['email_col']}"
         )
 
     if len(matches) > 1 and not email:
@@ -148,37 +259,6 @@ def find_data_subject(
     return matches[0]
 
 
-def extract_users(
-    rows: List[Dict],
-    name_col: str = None,
-    email_col: str = None
-) -> Dict[str, Dict]:
-    """Extract all users from CSV for redaction mapping."""
-    users = {}
-
-    if not rows:
-        return users
-
-    columns = list(rows[0].keys())
-
-    if not name_col:
-        name_col = detect_column(columns, NAME_COLUMNS)
-    if not email_col:
-        email_col = detect_column(columns, EMAIL_COLUMNS)
-
-    id_col = detect_column(columns, ID_COLUMNS)
-
-    for i, row in enumerate(rows):
-        user_id = str(row.get(id_col, i)) if id_col else str(i)
-        name = row.get(name_col, '') if name_col else ''
-        email_val = row.get(email_col, '') if email_col else ''
-
-        if name or email_val:
-            users[user_id] = {'name': name, 'email': email_val}
-
-    return users
-
-
 def extract_profile(data_subject: Dict) -> Dict[str, Any]:
     """Extract profile from the matched row."""
     raw = data_subject.get('raw', {})
@@ -193,61 +273,104 @@ def extract_profile(data_subject: Dict) -> Dict[str, Any]:
     return profile
 
 
+def match_name_rows(names: Dict[str, List[int]], ds_name: str) -> Set[int]:
+    """Return rows whose name contains, or is contained in, ds_name.
+
+    Works on distinct names rather than rows, scoring them in one
+    find_name_matches call.
+    """
+    # An empty name is contained in any other, which find_name_matches
+    # deliberately never reports
+    matched = set(names.get('', ()))
+
+    distinct = list(names)
+    for i in find_name_matches(ds_name, distinct):
+        matched.update(names[distinct[i]])
+
+    return matched
+
+
+def match_record_rows(index: Dict[str, Any], data_subject: Dict) -> List[int]:
+    """Return the row numbers belonging to the data subject, using a row index.
+
+    Email and id matches are hash lookups and name matches come from
+    match_name_rows, so the CSV itself is not re-read to find them.
+    """
+    ds_name = (data_subject.get('name') or '').lower()
+    ds_email = (data_subject.get('email') or '').lower()
+    ds_id = str(data_subject.get('id', ''))
+
+    matched = set()
+    if ds_email:
+        matched.update(index['email'].get(ds_email, ()))
+    if ds_id:
+        matched.update(index['id'].get(ds_id, ()))
+    if ds_name:
+        matched |= match_name_rows(index['names'], ds_name)
+    return sorted(matched)
+
+
 def extract_records(
-    rows: List[Dict],
+    rows: Iterable[List[str]],
+    columns: Dict[str, Any],
     data_subject: Dict,
-    name_col: str = None,
-    email_col: str = None
+    row_numbers: Optional[List[int]] = None
 ) -> List[Dict]:
-    """Extract records for the data subject."""
-    records = []
-
-    if not rows:
-        return records
-
-    columns = list(rows[0].keys())
+    """Extract records for the data subject.
 
-    if not name_col:
-        name_col = detect_column(columns, NAME_COLUMNS)
-    if not email_col:
-        email_col = detect_column(columns, EMAIL_COLUMNS)
+    If row_numbers (from match_record_rows) is given, only those rows are
+    read and reading stops after the last one.
+    """
+    records = []
+    wanted = set(row_numbers) if row_numbers is not None else None
+    last = row_numbers[-1] if row_numbers else -1
 
-    date_col = detect_column(columns, DATE_COLUMNS)
-    id_col = detect_column(columns, ID_COLUMNS)
+    name_idx = columns['name']
+    email_idx = columns['email']
+    id_idx = columns['id']
+    date_idx = columns['date']
 
     ds_name = (data_subject.get('name') or '').lower()
     ds_email = (data_subject.get('email') or '').lower()
     ds_id = str(data_subject.get('id', ''))
 
     for i, row in enumerate(rows):
-        # Check if this row belongs to the data subject
-        row_name = (row.get(name_col, '') or '').lower().strip() if name_col else ''
-        row_email = (row.get(email_col, '') or '').lower().strip() if email_col else ''
-        row_id = str(row.get(id_col, '')) if id_col else ''
-
-        is_match = False
-        if ds_email and row_email == ds_email:
-            is_match = True
-        elif ds_name and (ds_name in row_name or row_name in ds_name):
-            is_match = True
-        elif ds_id and row_id == ds_id:
-            is_match = True
-
-        if is_match:
-            # Build content from all columns
-            content_parts = []
-            for key, value in row.items():
-                if value is not None and str(value).strip():
-                    content_parts.append(f"{key}: {strip_html(str(value))[:200]}")
-
-            date_val = row.get(date_col, '') if date_col else ''
-
-            records.append({
-                'date': format_date(date_val) if date_val else f"Row {i}",
-                'type': 'record',
-                'category': 'Data',
-                'content': '\n'.join(content_parts[:20]),  # Limit fields
-            })
+        if wanted is not None:
+            if i > last:
+                break
+            if i not in wanted:
+                continue
+        else:
+            # Check if this row belongs to the data subject
+            row_name = cell(row, name_idx).lower().strip()
+            row_email = cell(row, email_idx).lower().strip()
+            row_id = cell(row, id_idx)
+
+            is_match = False
+            if ds_email and row_email == ds_email:
+                is_match = True
+            elif ds_name and (ds_name in row_name or row_name in ds_name):
+                is_match = True
+            elif ds_id and row_id == ds_id:
+                is_match = True
+
+            if not is_match:
+                continue
+
+        # Build content from all columns
+        content_parts = []
+        for key, value in row_to_dict(columns['header'], row).items():
+            if value is not None and str(value).strip():
+                content_parts.append(f"{key}: {strip_html(str(value), 200)}")
+
+        date_val = cell(row, date_idx)
+
+        records.append({
+            'date': format_date(date_val) if date_val else f"Row {i}",
+            'type': 'record',
+            'category': 'Data',
+            'content': '\n'.join(content_parts[:20]),  # Limit fields
+        })
 
     return records
 
@@ -293,30 +416,33 @@ def process(
 
     try:
         print(f"Loading CSV export from {export_path}...")
-        rows = load_csv(export_path)
-        print(f"  Loaded {len(rows)} rows")
-
-        if rows:
-            columns = list(rows[0].keys())
-            print(f"  Columns: {', '.join(columns[:10])}{'...' if len(columns) > 10 else ''}")
-
-            # Auto-detect columns
-            detected_name = name_col or detect_column(columns, NAME_COLUMNS)
-            detected_email = email_col or detect_column(columns, EMAIL_COLUMNS)
-            print(f"  Detected name column: {detected_name or 'None'}")
-            print(f"  Detected email column: {detected_email or 'None'}")
+        # Rows are streamed from disk: one pass finds the subject and
+        # collects users, a second collects the subject's records
+        encoding = detect_csv_encoding(export_path)
+        rows = iter_csv_rows(export_path, encoding)
+        header = next(rows, None)
+        if header is None:
+            raise ValueError("CSV file is empty")
+        print(f"  Columns: {', '.join(header[:10])}{'...' if len(header) > 10 else ''}")
+
+        # Auto-detect columns
+        columns = resolve_columns(header, name_col, email_col)
+        print(f"  Detected name column: {columns['name_col'] or 'None'}")
+        print(f"  Detected email column: {columns['email_col'] or 'None'}")
 
         print(f"\nSearching for data subject: {data_subject_name}...")
-        data_subject = find_data_subject(rows, data_subject_name, data_subject_email, name_col, email_col)
-        ds_id = data_subject['id']
+        users = {}
+        index = empty_row_index()
+        data_subject = find_data_subject(
+            rows, columns, data_subject_name, data_subject_email, users, index
+        )
         print(f"  Found: {data_subject['name']} ({data_subject.get('email', 'no email')})")
 
         print("Building redaction map...")
         engine = RedactionEngine(data_subject_name, data_subject_email)
 
-        users = extract_users(rows, name_col, email_col)
-        for user_id, user_info in users.items():
-            engine.add_user(user_id, user_info.get('name'), user_info.get('email'))
+        for user_id, (user_name, user_email) in users.items():
+            engine.add_user(user_id, user_name, user_email)
         print(f"  Mapped {engine.get_total_redactions()} entities for redaction")
 
         for name in (extra_redactions or []):
@@ -326,16 +452,22 @@ def process(
         profile = extract_profile(data_subject)
 
         print("Extracting records...")
-        records = extract_records(rows, data_subject, name_col, email_col)
+        records = extract_records(
+            islice(iter_csv_rows(export_path, encoding), 1, None),
+            columns,
+            data_subject,
+            match_record_rows(index, data_subject)
+        )
+        del index
         print(f"  Found {len(records)} records for data subject")
 
         print("Applying redactions...")
-        redacted_records = []
-        for record in records:
-            redacted = record.copy()
-            if 'content' in redacted:
-                redacted['content'] = engine.redact(str(redacted['content']))
-            redacted_records.append(redacted)
+        # Records are built locally and not reused, so redact them in place
+        contents = engine.redact_many(record['content'] for record in records)
+        for record, content in zip(records, contents):
+            record['content'] = content
+        del contents
+        redacted_records = records
 
         safe_name = safe_filename(data_subject_name)
         timestamp = get_timestamp()
@@ -14,7 +14,7 @@ import os
 import json
 import time
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -29,27 +29,78 @@ from core.activity_log import log_event
 VENDOR_NAME = "Generic_JSON"
 
 
-def find_users_in_data(data: Any, users: List[Dict] = None, path: str = "") -> List[Dict]:
-    """Recursively find objects that look like user records."""
-    if users is None:
-        users = []
-
-    if isinstance(data, dict):
-        # Check if this dict looks like a user
-        has_name = any(k.lower() in ['name', 'fullname', 'full_name', 'displayname', 'display_name',
-                                      'username', 'user_name'] for k in data.keys())
-        has_email = any(k.lower() in ['email', 'emailaddress', 'email_address', 'mail'] for k in data.keys())
-
-        if has_name or has_email:
-            users.append({'data': data, 'path': path})
+# Keys (lowercased) that mark a dict as a user-like record
+NAME_KEYS = frozenset({'name', 'fullname', 'full_name', 'displayname', 'display_name',
+                       'username', 'user_name'})
+EMAIL_KEYS = frozenset({'email', 'emailaddress', 'email_address', 'mail'})
+USER_KEYS = NAME_KEYS | EMAIL_KEYS
+
+# Keys (lowercased) read as a display name, or as a first name to pair with a last name
+DISPLAY_NAME_KEYS = frozenset({'name', 'fullname', 'full_name', 'displayname', 'display_name'})
+FIRST_NAME_KEYS = frozenset({'firstname', 'first_name'})
+
+# Keys that link an object to a user, as read by find_records_for_user
+LINK_KEYS = frozenset({'userId', 'user_id', 'authorId', 'author_id', 'email', 'userEmail'})
+
+# Profile fields in display order, each with its candidate keys in priority order
+PROFILE_FIELDS = [
+    ('id', ['id', 'Id', '_id', 'userId', 'user_id']),
+    ('Name', ['name', 'fullName', 'full_name', 'displayName', 'display_name']),
+    ('Email', ['email', 'emailAddress', 'email_address', 'mail']),
+    ('Phone', ['phone', 'phoneNumber', 'phone_number', 'mobile']),
+    ('Title', ['title', 'jobTitle', 'job_title', 'role']),
+    ('Company', ['company', 'organization', 'org']),
+    ('Created', ['created', 'createdAt', 'created_at', 'dateCreated']),
+    ('Updated', ['updated', 'updatedAt', 'updated_at', 'lastModified']),
+]
+PROFILE_DATE_FIELDS = frozenset({'Created', 'Updated'})
+
+# Candidate key -> (profile field, priority), so a profile is read in one pass
+PROFILE_KEY_FIELDS: Dict[str, Tuple[str, int]] = {}
+for _display, _keys in PROFILE_FIELDS:
+    for _priority, _key in enumerate(_keys):
+        PROFILE_KEY_FIELDS.setdefault(_key, (_display, _priority))
+
+
+def walk_json(data: Any) -> Iterator[Tuple[Dict, str]]:
+    """Yield every object in a JSON tree with its path, in document order.
+
+    Uses an explicit stack rather than recursion, so deeply nested exports
+    cannot hit the interpreter's recursion limit.
+    """
+    stack = [(data, "")]
+    while stack:
+        node, path = stack.pop()
+        if isinstance(node, dict):
+            yield node, path
+            children = [
+                (value, f"{path}.{key}" if path else key)
+                for key, value in node.items()
+                if isinstance(value, (dict, list))
+            ]
+        elif isinstance(node, list):
+            children = [
+                (item, f"{path}[{i}]")
+                for i, item in enumerate(node)
+                if isinstance(item, (dict, list))
+            ]
+        else:
+            continue
+        # Reversed so children are popped (and yielded) in their original order
+        stack.extend(reversed(children))
 
-        for key, value in data.items():
-            find_users_in_data(value, users, f"{path}.{key}" if path else key)
 
-    elif isinstance(data, list):
-        for i, item in enumerate(data):
-            find_users_in_data(item, users, f"{path}[{i}]")
+def find_users_in_data(nodes: Iterable[Tuple[Dict, str]]) -> List[Dict]:
+    """Find objects that look like user records among walked JSON objects.
 
+    Each entry carries the object's name and email (from extract_name_email)
+    so later passes don't have to re-read them.
+    """
+    users = []
+    for node, path in nodes:
+        if not USER_KEYS.isdisjoint(map(str.lower, node)):
+            name, email = extract_name_email(node)
+            users.append({'data': node, 'path': path, 'name': name, 'email': email})
     return users
 
 
@@ -59,15 +110,15 @@ def extract_name_email(obj: Dict) -> tuple:
     email = None
 
     for key, value in obj.items():
-        key_lower = key.lower()
         if not isinstance(value, str):
             continue
+        key_lower = key.lower()
 
-        if key_lower in ['email', 'emailaddress', 'email_address', 'mail']:
+        if key_lower in EMAIL_KEYS:
             email = value
-        elif key_lower in ['name', 'fullname', 'full_name', 'displayname', 'display_name']:
+        elif key_lower in DISPLAY_NAME_KEYS:
             name = value
-        elif key_lower in ['firstname', 'first_name']:
+        elif key_lower in FIRST_NAME_KEYS:
             first = value
             last = obj.get('lastName', obj.get('last_name', obj.get('lastname', '')))
             name = f"{first} {last}".strip()
@@ -75,23 +126,25 @@ def extract_name_email(obj: Dict) -> tuple:
     return name, email
 
 
-def find_data_subject(data: Any, name: str, email: str = None) -> Optional[Dict]:
-    """Find data subject in generic JSON structure."""
-    users = find_users_in_data(data)
+def find_data_subject(users: List[Dict], name: str, email: str = None) -> Optional[Dict]:
+    """Find data subject among user-like objects from find_users_in_data."""
     matches = []
     name_lower = name.lower()
+    email_lower = email.lower() if email else None
 
     for user_entry in users:
         user_data = user_entry['data']
-        user_name, user_email = extract_name_email(user_data)
+        user_name, user_email = user_entry['name'], user_entry['email']
 
         if not user_name and not user_email:
             continue
 
+        user_name_lower = user_name.lower() if user_name else ''
+
         is_match = False
-        if email and user_email and user_email.lower() == email.lower():
+        if email_lower and user_email and user_email.lower() == email_lower:
             is_match = True
-        elif user_name and (name_lower in user_name.lower() or user_name.lower() in name_lower):
+        elif user_name_lower and (name_lower in user_name_lower or user_name_lower in name_lower):
             is_match = True
 
         if is_match:
@@ -102,6 +155,9 @@ def find_data_subject(data: Any, name: str, email: str = None) -> Optional[Dict]
                 'raw': user_data,
                 'path': user_entry['path'],
             })
+            if email:
+                # With an email the first match is returned, so stop here
+                break
 
     if not matches:
         raise ValueError(f"Data subject '{name}' not found in export")
@@ -112,12 +168,12 @@ def find_data_subject(data: Any, name: str, email: str = None) -> Optional[Dict]
     return matches[0]
 
 
-def extract_users(data: Any) -> Dict[str, Dict]:
+def extract_users(user_entries: List[Dict]) -> Dict[str, Dict]:
     """Extract all user-like objects for redaction."""
     users = {}
-    for user_entry in find_users_in_data(data):
+    for user_entry in user_entries:
         user_data = user_entry['data']
-        name, email = extract_name_email(user_data)
+        name, email = user_entry['name'], user_entry['email']
         user_id = str(user_data.get('id', user_data.get('Id', user_data.get('_id', user_entry['path']))))
         if name or email:
             users[user_id] = {'name': name, 'email': email}
@@ -129,26 +185,21 @@ def extract_profile(data_subject: Dict) -> Dict[str, Any]:
     raw = data_subject.get('raw', {})
     profile = {}
 
-    # Common field mappings
-    field_mappings = [
-        ('id', ['id', 'Id', '_id', 'userId', 'user_id']),
-        ('Name', ['name', 'fullName', 'full_name', 'displayName', 'display_name']),
-        ('Email', ['email', 'emailAddress', 'email_address', 'mail']),
-        ('Phone', ['phone', 'phoneNumber', 'phone_number', 'mobile']),
-        ('Title', ['title', 'jobTitle', 'job_title', 'role']),
-        ('Company', ['company', 'organization', 'org']),
-        ('Created', ['created', 'createdAt', 'created_at', 'dateCreated']),
-        ('Updated', ['updated', 'updatedAt', 'updated_at', 'lastModified']),
-    ]
-
-    for display_name, keys in field_mappings:
-        for key in keys:
-            if key in raw:
-                value = raw[key]
-                if display_name in ['Created', 'Updated']:
-                    value = format_date(value)
-                profile[display_name] = value
-                break
+    # Pick the highest-priority key present for each common field
+    chosen = {}
+    for key in raw:
+        field = PROFILE_KEY_FIELDS.get(key)
+        if field is not None:
+            display_name, priority = field
+            if display_name not in chosen or priority < chosen[display_name][0]:
+                chosen[display_name] = (priority, key)
+
+    for display_name, _ in PROFILE_FIELDS:
+        if display_name in chosen:
+            value = raw[chosen[display_name][1]]
+            if display_name in PROFILE_DATE_FIELDS:
+                value = format_date(value)
+            profile[display_name] = value
 
     # Add any remaining string fields
     for key, value in raw.items():
@@ -158,12 +209,15 @@ def extract_profile(data_subject: Dict) -> Dict[str, Any]:
     return profile
 
 
-def find_records_for_user(data: Any, data_subject_id: str, records: List[Dict] = None, path: str = "") -> List[Dict]:
-    """Find records associated with the data subject."""
-    if records is None:
-        records = []
+def find_records_for_user(nodes: Iterable[Tuple[Dict, str]], data_subject_id: str) -> List[Dict]:
+    """Find records associated with the data subject among walked JSON objects."""
+    records = []
+
+    for data, path in nodes:
+        # Most objects carry no linking key, so they can only match an empty id
+        if data_subject_id and LINK_KEYS.isdisjoint(data):
+            continue
 
-    if isinstance(data, dict):
         # Check if this object is associated with the data subject
         obj_id = str(data.get('userId', data.get('user_id', data.get('authorId', data.get('author_id', '')))))
         obj_email = data.get('email', data.get('userEmail', ''))
@@ -174,7 +228,9 @@ def find_records_for_user(data: Any, data_subject_id: str, records: List[Dict] =
             # Extract record info
             date_val = data.get('date', data.get('created', data.get('createdAt', data.get('timestamp', ''))))
             type_val = data.get('type', data.get('action', data.get('event', path.split('.')[-1] if path else 'record')))
-            content = data.get('content', data.get('text', data.get('body', data.get('message', str(data)))))
+            # Only stringify the whole object when it has no content field
+            content_key = next((k for k in ('content', 'text', 'body', 'message') if k in data), None)
+            content = data[content_key] if content_key else str(data)
 
             records.append({
                 'date': format_date(date_val) if date_val else 'N/A',
@@ -183,13 +239,6 @@ def find_records_for_user(data: Any, data_subject_id: str, records: List[Dict] =
                 'content': strip_html(str(content)[:1000]),
             })
 
-        for key, value in data.items():
-            find_records_for_user(value, data_subject_id, records, f"{path}.{key}" if path else key)
-
-    elif isinstance(data, list):
-        for i, item in enumerate(data):
-            find_records_for_user(item, data_subject_id, records, f"{path}[{i}]")
-
     return records
 
 
@@ -213,14 +262,18 @@ def process(export_path: str, data_subject_name: str, data_subject_email: str =
         print(f"Loading JSON export from {export_path}...")
         data = load_json(export_path)
 
+        # Walk the export once; users and records are both picked from these
+        nodes = list(walk_json(data))
+        users = find_users_in_data(nodes)
+
         print(f"Searching for data subject: {data_subject_name}...")
-        data_subject = find_data_subject(data, data_subject_name, data_subject_email)
+        data_subject = find_data_subject(users, data_subject_name, data_subject_email)
         ds_id = str(data_subject['id'])
         print(f"  Found: {data_subject['name']} (path: {data_subject.get('path', 'root')})")
 
         print("Building redaction map...")
         engine = RedactionEngine(data_subject_name, data_subject_email)
-        for user_id, user_info in extract_users(data).items():
+        for user_id, user_info in extract_users(users).items():
             engine.add_user(user_id, user_info.get('name'), user_info.get('email'))
         for name in (extra_redactions or []):
             engine.add_external(name)
@@ -230,11 +283,16 @@ def process(export_path: str, data_subject_name: str, data_subject_email: str =
         profile = extract_profile(data_subject)
 
         print("Searching for associated records...")
-        records = find_records_for_user(data, ds_id)
+        records = find_records_for_user(nodes, ds_id)
         print(f"  Found {len(records)} records")
 
         print("Applying redactions...")
-        redacted_records = [{**r, 'content': engine.redact(str(r.get('content', '')))} for r in records]
+        # Records are built locally and not reused, so redact them in place
+        contents = engine.redact_many(str(record.get('content', '')) for record in records)
+        for record, content in zip(records, contents):
+            record['content'] = content
+        del contents
+        redacted_records = records
 
         safe_name = safe_filename(data_subject_name)
         timestamp = get_timestamp()
@@ -14,6 +14,7 @@ Usage:
 import sys
 import os
 import time
+from operator import itemgetter
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
@@ -30,8 +31,12 @@ from core.utils import (
     ensure_output_dir,
     safe_filename,
     format_date,
+    extract_fields,
+    join_fields,
     get_timestamp,
     validate_data_subject_match,
+    find_name_matches,
+    id_lookup_keys,
 )
 from core.activity_log import log_event
 
@@ -47,6 +52,16 @@ def load_export(export_path: str) -> Dict[str, Any]:
         return load_json(export_path)
 
 
+def subject_match(emp: Dict) -> Dict:
+    """Build the data subject match entry for an employee record."""
+    return {
+        'id': emp.get('id') or emp.get('employeeId') or emp.get('employee_id'),
+        'name': f"{emp.get('firstName', emp.get('first_name', ''))} {emp.get('lastName', emp.get('last_name', ''))}".strip(),
+        'email': emp.get('workEmail') or emp.get('email'),
+        'raw': emp,
+    }
+
+
 def find_data_subject(
     data: Dict[str, Any],
     name: str,
@@ -54,31 +69,41 @@ def find_data_subject(
 ) -> Optional[Dict]:
     """Find the data subject in BambooHR employees."""
     employees = data.get('employees', data.get('data', []))
-    matches = []
+
+    if email:
+        # validate_data_subject_match settles on the one employee whose email
+        # matches however many names also match, so check for that first
+        email_lower = email.lower()
+        email_hits = [
+            emp for emp in employees
+            if (emp.get('workEmail') or emp.get('email') or '').lower() == email_lower
+        ]
+        if len(email_hits) == 1:
+            return subject_match(email_hits[0])
+
     name_lower = name.lower()
+    email_lower = (email or '').lower()
+    hits = set()
+    full_names = []
+    display_names = []
 
-    for emp in employees:
-        emp_email = (emp.get('workEmail') or emp.get('email') or emp.get('homeEmail') or '').lower()
+    for i, emp in enumerate(employees):
         first_name = (emp.get('firstName') or emp.get('first_name') or '').lower()
         last_name = (emp.get('lastName') or emp.get('last_name') or '').lower()
         full_name = f"{first_name} {last_name}".strip()
-        display_name = (emp.get('displayName') or emp.get('display_name') or '').lower()
-
-        is_match = False
-        if email and emp_email == email.lower():
-            is_match = True
-        elif name_lower in full_name or full_name in name_lower:
-            is_match = True
-        elif display_name and (name_lower in display_name or display_name in name_lower):
-            is_match = True
-
-        if is_match:
-            matches.append({
-                'id': emp.get('id') or emp.get('employeeId') or emp.get('employee_id'),
-                'name': f"{emp.get('firstName', emp.get('first_name', ''))} {emp.get('lastName', emp.get('last_name', ''))}".strip(),
-                'email': emp.get('workEmail') or emp.get('email'),
-                'raw': emp,
-            })
+        # An empty name is contained in any other (and vice versa), which
+        # find_name_matches deliberately never reports
+        if not full_name or not name_lower:
+            hits.add(i)
+        elif email_lower and (emp.get('workEmail') or emp.get('email') or emp.get('homeEmail') or '').lower() == email_lower:
+            hits.add(i)
+        full_names.append(full_name)
+        display_names.append(emp.get('displayName') or emp.get('display_name'))
+
+    # Both name columns are scored in one batched call each
+    hits.update(find_name_matches(name, full_names))
+    hits.update(find_name_matches(name, display_names))
+    matches = [subject_match(employees[i]) for i in sorted(hits)]
 
     return validate_data_subject_match(matches, name, email)
 
@@ -87,6 +112,10 @@ def extract_users(data: Dict[str, Any]) -> Dict[str, Dict]:
     """Extract all employees for redaction mapping."""
     users = {}
 
+    # Collected in the same pass and added once every employee is known, so
+    # an employee entry always wins over a bare supervisor name
+    supervisors = {}
+
     for emp in data.get('employees', data.get('data', [])):
         emp_id = str(emp.get('id') or emp.get('employeeId') or emp.get('employee_id', ''))
         if emp_id:
@@ -94,57 +123,61 @@ def extract_users(data: Dict[str, Any]) -> Dict[str, Dict]:
                 'name': f"{emp.get('firstName', emp.get('first_name', ''))} {emp.get('lastName', emp.get('last_name', ''))}".strip(),
                 'email': emp.get('workEmail') or emp.get('email'),
             }
-
-    # Extract supervisors
-    for emp in data.get('employees', data.get('data', [])):
         supervisor_id = emp.get('supervisorId') or emp.get('supervisor_id')
         supervisor_name = emp.get('supervisor') or emp.get('supervisorName')
-        if supervisor_id and supervisor_name and str(supervisor_id) not in users:
-            users[str(supervisor_id)] = {'name': supervisor_name, 'email': None}
+        if supervisor_id and supervisor_name:
+            supervisors.setdefault(str(supervisor_id), supervisor_name)
+
+    for supervisor_id, supervisor_name in supervisors.items():
+        if supervisor_id not in users:
+            users[supervisor_id] = {'name': supervisor_name, 'email': None}
 
     return users
 
 
+ADDRESS_FIELDS = (('address1', 'street1'), ('address2', 'street2'), 'city', 'state', ('zipcode', 'zip'), 'country')
+
+PROFILE_FIELDS = (
+    ('Employee ID', ('id', 'employeeId')),
+    ('First Name', ('firstName', 'first_name')),
+    ('Last Name', ('lastName', 'last_name')),
+    ('Display Name', ('displayName', 'display_name')),
+    ('Preferred Name', ('preferredName', 'preferred_name')),
+    ('Work Email', ('workEmail', 'email')),
+    ('Home Email', ('homeEmail', 'home_email')),
+    ('Mobile Phone', ('mobilePhone', 'mobile_phone')),
+    ('Work Phone', ('workPhone', 'work_phone')),
+    ('Home Phone', ('homePhone', 'home_phone')),
+    ('Job Title', ('jobTitle', 'job_title')),
+    ('Department', 'department'),
+    ('Division', 'division'),
+    ('Location', 'location'),
+    ('Supervisor', ('supervisor', 'supervisorName')),
+    ('Hire Date', ('hireDate', 'hire_date'), format_date),
+    ('Original Hire Date', ('originalHireDate', 'original_hire_date'), format_date),
+    ('Termination Date', ('terminationDate', 'termination_date'), format_date),
+    ('Employment Status', ('employmentStatus', 'employment_status', 'status')),
+    ('Employment Type', ('employmentHistoryStatus', 'employment_type')),
+    ('Pay Rate', ('payRate', 'pay_rate')),
+    ('Pay Type', ('payType', 'pay_type')),
+    ('Pay Period', ('payPeriod', 'pay_period')),
+    ('Date of Birth', ('dateOfBirth', 'date_of_birth'), format_date),
+    ('Age', 'age'),
+    ('Gender', 'gender'),
+    ('Marital Status', ('maritalStatus', 'marital_status')),
+    ('SSN (masked)', lambda raw: '***-**-' + str(raw.get('ssn', raw.get('socialSecurityNumber', '')))[-4:] if raw.get('ssn') or raw.get('socialSecurityNumber') else 'N/A'),
+    ('Address', lambda raw: join_fields(raw, ADDRESS_FIELDS)),
+    ('Emergency Contact', ('emergencyContactName', 'emergency_contact_name')),
+    ('Emergency Phone', ('emergencyContactPhone', 'emergency_contact_phone')),
+    ('Ethnicity', 'ethnicity'),
+    ('EEO Job Category', ('eeo', 'eeoCategory')),
+    ('FLSA Status', ('flsaCode', 'exempt')),
+)
+
+
 def extract_profile(data_subject: Dict) -> Dict[str, Any]:
     """Extract profile data for the data subject."""
-    raw = data_subject.get('raw', {})
-
-    return {
-        'Employee ID': raw.get('id') or raw.get('employeeId'),
-        'First Name': raw.get('firstName') or raw.get('first_name'),
-        'Last Name': raw.get('lastName') or raw.get('last_name'),
-        'Display Name': raw.get('displayName') or raw.get('display_name'),
-        'Preferred Name': raw.get('preferredName') or raw.get('preferred_name'),
-        'Work Email': raw.get('workEmail') or raw.get('email'),
-        'Home Email': raw.get('homeEmail') or raw.get('home_email'),
-        'Mobile Phone': raw.get('mobilePhone') or raw.get('mobile_phone'),
-        'Work Phone': raw.get('workPhone') or raw.get('work_phone'),
-        'Home Phone': raw.get('homePhone') or raw.get('home_phone'),
-        'Job Title': raw.get('jobTitle') or raw.get('job_title'),
-        'Department': raw.get('department'),
-        'Division': raw.get('division'),
-        'Location': raw.get('location'),
-        'Supervisor': raw.get('supervisor') or raw.get('supervisorName'),
-        'Hire Date': format_date(raw.get('hireDate') or raw.get('hire_date')),
-        'Original Hire Date': format_date(raw.get('originalHireDate') or raw.get('original_hire_date')),
-        'Termination Date': format_date(raw.get('terminationDate') or raw.get('termination_date')),
-        'Employment Status': raw.get('employmentStatus') or raw.get('employment_status') or raw.get('status'),
-        'Employment Type': raw.get('employmentHistoryStatus') or raw.get('employment_type'),
-        'Pay Rate': raw.get('payRate') or raw.get('pay_rate'),
-        'Pay Type': raw.get('payType') or raw.get('pay_type'),
-        'Pay Period': raw.get('payPeriod') or raw.get('pay_period'),
-        'Date of Birth': format_date(raw.get('dateOfBirth') or raw.get('date_of_birth')),
-        'Age': raw.get('age'),
-        'Gender': raw.get('gender'),
-        'Marital Status': raw.get('maritalStatus') or raw.get('marital_status'),
-        'SSN (masked)': '***-**-' + str(raw.get('ssn', raw.get('socialSecurityNumber', '')))[-4:] if raw.get('ssn') or raw.get('socialSecurityNumber') else 'N/A',
-        'Address': f"{raw.get('address1', raw.get('street1', ''))} {raw.get('address2', raw.get('street2', ''))} {raw.get('city', '')} {raw.get('state', '')} {raw.get('zipcode', raw.get('zip', ''))} {raw.get('country', '')}".strip(),
-        'Emergency Contact': raw.get('emergencyContactName') or raw.get('emergency_contact_name'),
-        'Emergency Phone': raw.get('emergencyContactPhone') or raw.get('emergency_contact_phone'),
-        'Ethnicity': raw.get('ethnicity'),
-        'EEO Job Category': raw.get('eeo') or raw.get('eeoCategory'),
-        'FLSA Status': raw.get('flsaCode') or raw.get('exempt'),
-    }
+    return extract_fields(data_subject.get('raw', {}), PROFILE_FIELDS)
 
 
 def extract_records(
@@ -154,10 +187,12 @@ def extract_records(
     """Extract all time off, documents, and performance records for the data subject."""
     records = []
     ds_id = str(data_subject_id)
+    # Rows are matched on their raw id, without coercing each one to a string
+    match_ids = id_lookup_keys(ds_id)
 
     # Time off requests
     for request in data.get('timeOffRequests', data.get('time_off_requests', data.get('timeOff', []))):
-        if str(request.get('employeeId') or request.get('employee_id', '')) == ds_id:
+        if (request.get('employeeId') or request.get('employee_id', '')) in match_ids:
             records.append({
                 'date': format_date(request.get('created') or request.get('created_at')),
                 'type': 'time_off_request',
@@ -167,7 +202,7 @@ def extract_records(
 
     # Performance/goals
     for goal in data.get('goals', data.get('performance', [])):
-        if str(goal.get('employeeId') or goal.get('employee_id', '')) == ds_id:
+        if (goal.get('employeeId') or goal.get('employee_id', '')) in match_ids:
             records.append({
                 'date': format_date(goal.get('createdDate') or goal.get('created_at')),
                 'type': 'goal',
@@ -177,7 +212,7 @@ def extract_records(
 
     # Training records
     for training in data.get('training', data.get('trainingRecords', [])):
-        if str(training.get('employeeId') or training.get('employee_id', '')) == ds_id:
+        if (training.get('employeeId') or training.get('employee_id', '')) in match_ids:
             records.append({
                 'date': format_date(training.get('completedDate') or training.get('completed_date')),
                 'type': 'training',
@@ -187,7 +222,7 @@ def extract_records(
 
     # Documents
     for doc in data.get('documents', data.get('files', [])):
-        if str(doc.get('employeeId') or doc.get('employee_id', '')) == ds_id:
+        if (doc.get('employeeId') or doc.get('employee_id', '')) in match_ids:
             records.append({
                 'date': format_date(doc.get('createdDate') or doc.get('created_at') or doc.get('dateAdded')),
                 'type': 'document',
@@ -197,7 +232,7 @@ def extract_records(
 
     # Employment history
     for history in data.get('employmentHistory', data.get('employment_history', [])):
-        if str(history.get('employeeId') or history.get('employee_id', '')) == ds_id:
+        if (history.get('employeeId') or history.get('employee_id', '')) in match_ids:
             records.append({
                 'date': format_date(history.get('date') or history.get('effectiveDate')),
                 'type': 'employment_change',
@@ -207,7 +242,7 @@ def extract_records(
 
     # Compensation history
     for comp in data.get('compensation', data.get('compensationHistory', [])):
-        if str(comp.get('employeeId') or comp.get('employee_id', '')) == ds_id:
+        if (comp.get('employeeId') or comp.get('employee_id', '')) in match_ids:
             records.append({
                 'date': format_date(comp.get('startDate') or comp.get('effectiveDate')),
                 'type': 'compensation_change',
@@ -216,7 +251,7 @@ def extract_records(
             })
 
     # Sort by date
-    records.sort(key=lambda r: r.get('date', ''), reverse=True)
+    records.sort(key=itemgetter('date'), reverse=True)
     return records
 
 
@@ -230,8 +265,8 @@ def process(
     """Process a BambooHR export for DSAR response."""
     start_time = time.time()
 
-    ensure_output_dir(output_dir)
-    ensure_output_dir(os.path.join(output_dir, 'internal'))
+    # Creating the internal directory creates output_dir along with it
+    internal_dir = ensure_output_dir(os.path.join(output_dir, 'internal'))
 
     log_event(
         'processing_started',
@@ -270,12 +305,12 @@ def process(
         print(f"  Found {len(records)} records for data subject")
 
         print("Applying redactions...")
-        redacted_records = []
-        for record in records:
-            redacted = record.copy()
-            if 'content' in redacted:
-                redacted['content'] = engine.redact(str(redacted['content']))
-            redacted_records.append(redacted)
+        # Records are built locally and not reused, so redact them in place
+        contents = engine.redact_many(record['content'] for record in records)
+        for record, content in zip(records, contents):
+            record['content'] = content
+        del contents
+        redacted_records = records
 
         safe_name = safe_filename(data_subject_name)
         timestamp = get_timestamp()
@@ -306,7 +341,7 @@ def process(
         json_path = os.path.join(output_dir, f"{VENDOR_NAME}_DSAR_{safe_name}_{timestamp}.json")
         save_json(json_data, json_path)
 
-        key_path = os.path.join(output_dir, 'internal', f"{VENDOR_NAME}_REDACTION_KEY_{safe_name}_{timestamp}.json")
+        key_path = os.path.join(internal_dir, f"{VENDOR_NAME}_REDACTION_KEY_{safe_name}_{timestamp}.json")
         save_json(engine.get_redaction_key(), key_path)
 
         stats = engine.get_stats()
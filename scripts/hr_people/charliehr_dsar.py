@@ -15,6 +15,7 @@ import sys
 import os
 import json
 import time
+from operator import itemgetter
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
@@ -31,8 +32,12 @@ from core.utils import (
     ensure_output_dir,
     safe_filename,
     format_date,
+    extract_fields,
+    join_fields,
     get_timestamp,
     validate_data_subject_match,
+    find_name_matches,
+    id_lookup_keys,
 )
 from core.activity_log import log_event
 
@@ -48,6 +53,16 @@ def load_export(export_path: str) -> Dict[str, Any]:
         return load_json(export_path)
 
 
+def subject_match(emp: Dict) -> Dict:
+    """Build the data subject match entry for an employee record."""
+    return {
+        'id': emp.get('id') or emp.get('employee_id'),
+        'name': f"{emp.get('first_name', emp.get('firstName', ''))} {emp.get('last_name', emp.get('lastName', ''))}".strip(),
+        'email': emp.get('email') or emp.get('work_email'),
+        'raw': emp,
+    }
+
+
 def find_data_subject(
     data: Dict[str, Any],
     name: str,
@@ -55,31 +70,41 @@ def find_data_subject(
 ) -> Optional[Dict]:
     """Find the data subject in CharlieHR employees."""
     employees = data.get('employees', data.get('team_members', []))
-    matches = []
+
+    if email:
+        # validate_data_subject_match settles on the one employee whose email
+        # matches however many names also match, so check for that first
+        email_lower = email.lower()
+        email_hits = [
+            emp for emp in employees
+            if (emp.get('email') or emp.get('work_email') or '').lower() == email_lower
+        ]
+        if len(email_hits) == 1:
+            return subject_match(email_hits[0])
+
     name_lower = name.lower()
+    email_lower = (email or '').lower()
+    hits = set()
+    full_names = []
+    preferred_names = []
 
-    for emp in employees:
-        emp_email = (emp.get('email') or emp.get('work_email') or '').lower()
+    for i, emp in enumerate(employees):
         first_name = (emp.get('first_name') or emp.get('firstName') or '').lower()
         last_name = (emp.get('last_name') or emp.get('lastName') or '').lower()
         full_name = f"{first_name} {last_name}".strip()
-        preferred_name = (emp.get('preferred_name') or emp.get('preferredName') or '').lower()
-
-        is_match = False
-        if email and emp_email == email.lower():
-            is_match = True
-        elif name_lower in full_name or full_name in name_lower:
-            is_match = True
-        elif preferred_name and (name_lower in preferred_name or preferred_name in name_lower):
-            is_match = True
-
-        if is_match:
-            matches.append({
-                'id': emp.get('id') or emp.get('employee_id'),
-                'name': f"{emp.get('first_name', emp.get('firstName', ''))} {emp.get('last_name', emp.get('lastName', ''))}".strip(),
-                'email': emp.get('email') or emp.get('work_email'),
-                'raw': emp,
-            })
+        # An empty name is contained in any other (and vice versa), which
+        # find_name_matches deliberately never reports
+        if not full_name or not name_lower:
+            hits.add(i)
+        elif email_lower and (emp.get('email') or emp.get('work_email') or '').lower() == email_lower:
+            hits.add(i)
+        full_names.append(full_name)
+        preferred_names.append(emp.get('preferred_name') or emp.get('preferredName'))
+
+    # Both name columns are scored in one batched call each
+    hits.update(find_name_matches(name, full_names))
+    hits.update(find_name_matches(name, preferred_names))
+    matches = [subject_match(employees[i]) for i in sorted(hits)]
 
     return validate_data_subject_match(matches, name, email)
 
@@ -89,6 +114,10 @@ def extract_users(data: Dict[str, Any]) -> Dict[str, Dict]:
     users = {}
     employees = data.get('employees', data.get('team_members', []))
 
+    # Collected in the same pass and added once every employee is known, so
+    # an employee entry always wins over a bare manager name
+    managers = {}
+
     for emp in employees:
         emp_id = str(emp.get('id') or emp.get('employee_id', ''))
         if emp_id:
@@ -96,47 +125,51 @@ def extract_users(data: Dict[str, Any]) -> Dict[str, Dict]:
                 'name': f"{emp.get('first_name', emp.get('firstName', ''))} {emp.get('last_name', emp.get('lastName', ''))}".strip(),
                 'email': emp.get('email') or emp.get('work_email'),
             }
-
-    # Extract managers
-    for emp in employees:
         manager_id = emp.get('manager_id') or emp.get('managerId')
         manager_name = emp.get('manager_name') or emp.get('managerName')
-        if manager_id and manager_name and str(manager_id) not in users:
-            users[str(manager_id)] = {'name': manager_name, 'email': None}
+        if manager_id and manager_name:
+            managers.setdefault(str(manager_id), manager_name)
+
+    for manager_id, manager_name in managers.items():
+        if manager_id not in users:
+            users[manager_id] = {'name': manager_name, 'email': None}
 
     return users
 
 
+ADDRESS_FIELDS = ('address_line_1', 'address_line_2', 'city', 'postcode')
+
+PROFILE_FIELDS = (
+    ('Employee ID', ('id', 'employee_id')),
+    ('First Name', ('first_name', 'firstName')),
+    ('Last Name', ('last_name', 'lastName')),
+    ('Preferred Name', ('preferred_name', 'preferredName')),
+    ('Email', ('email', 'work_email')),
+    ('Personal Email', ('personal_email', 'personalEmail')),
+    ('Phone', ('phone', 'mobile_phone')),
+    ('Job Title', ('job_title', 'jobTitle')),
+    ('Department', 'department'),
+    ('Location', ('location', 'office')),
+    ('Manager', ('manager_name', 'managerName')),
+    ('Start Date', ('start_date', 'startDate'), format_date),
+    ('Probation End', ('probation_end_date', 'probationEndDate'), format_date),
+    ('Employment Type', ('employment_type', 'employmentType')),
+    ('Contract Type', ('contract_type', 'contractType')),
+    ('Working Pattern', ('working_pattern', 'workingPattern')),
+    ('Date of Birth', ('date_of_birth', 'dateOfBirth'), format_date),
+    ('Gender', 'gender'),
+    ('Nationality', 'nationality'),
+    ('Address', lambda raw: join_fields(raw, ADDRESS_FIELDS)),
+    ('Emergency Contact', ('emergency_contact_name', 'emergencyContactName')),
+    ('Emergency Phone', ('emergency_contact_phone', 'emergencyContactPhone')),
+    ('Bank Account (masked)', lambda raw: '****' + str(raw.get('bank_account_number', ''))[-4:] if raw.get('bank_account_number') else 'N/A'),
+    ('NI Number (masked)', lambda raw: '****' + str(raw.get('ni_number') or raw.get('national_insurance_number', ''))[-4:] if raw.get('ni_number') or raw.get('national_insurance_number') else 'N/A'),
+)
+
+
 def extract_profile(data_subject: Dict) -> Dict[str, Any]:
     """Extract profile data for the data subject."""
-    raw = data_subject.get('raw', {})
-
-    return {
-        'Employee ID': data_subject.get('id'),
-        'First Name': raw.get('first_name') or raw.get('firstName'),
-        'Last Name': raw.get('last_name') or raw.get('lastName'),
-        'Preferred Name': raw.get('preferred_name') or raw.get('preferredName'),
-        'Email': raw.get('email') or raw.get('work_email'),
-        'Personal Email': raw.get('personal_email') or raw.get('personalEmail'),
-        'Phone': raw.get('phone') or raw.get('mobile_phone'),
-        'Job Title': raw.get('job_title') or raw.get('jobTitle'),
-        'Department': raw.get('department'),
-        'Location': raw.get('location') or raw.get('office'),
-        'Manager': raw.get('manager_name') or raw.get('managerName'),
-        'Start Date': format_date(raw.get('start_date') or raw.get('startDate')),
-        'Probation End': format_date(raw.get('probation_end_date') or raw.get('probationEndDate')),
-        'Employment Type': raw.get('employment_type') or raw.get('employmentType'),
-        'Contract Type': raw.get('contract_type') or raw.get('contractType'),
-        'Working Pattern': raw.get('working_pattern') or raw.get('workingPattern'),
-        'Date of Birth': format_date(raw.get('date_of_birth') or raw.get('dateOfBirth')),
-        'Gender': raw.get('gender'),
-        'Nationality': raw.get('nationality'),
-        'Address': f"{raw.get('address_line_1', '')} {raw.get('address_line_2', '')} {raw.get('city', '')} {raw.get('postcode', '')}".strip(),
-        'Emergency Contact': raw.get('emergency_contact_name') or raw.get('emergencyContactName'),
-        'Emergency Phone': raw.get('emergency_contact_phone') or raw.get('emergencyContactPhone'),
-        'Bank Account (masked)': '****' + str(raw.get('bank_account_number', ''))[-4:] if raw.get('bank_account_number') else 'N/A',
-        'NI Number (masked)': '****' + str(raw.get('ni_number') or raw.get('national_insurance_number', ''))[-4:] if raw.get('ni_number') or raw.get('national_insurance_number') else 'N/A',
-    }
+    return extract_fields(data_subject.get('raw', {}), PROFILE_FIELDS)
 
 
 def extract_records(
@@ -146,10 +179,12 @@ def extract_records(
     """Extract all activity records for the data subject."""
     records = []
     ds_id = str(data_subject_id)
+    # Rows are matched on their raw id, without coercing each one to a string
+    match_ids = id_lookup_keys(ds_id)
 
     # Time off requests
     for request in data.get('time_off_requests', data.get('timeOffRequests', [])):
-        if str(request.get('employee_id') or request.get('employeeId', '')) == ds_id:
+        if (request.get('employee_id') or request.get('employeeId', '')) in match_ids:
             records.append({
                 'date': format_date(request.get('created_at') or request.get('createdAt')),
                 'type': 'time_off_request',
@@ -159,7 +194,7 @@ def extract_records(
 
     # Reviews/check-ins
     for review in data.get('reviews', data.get('check_ins', [])):
-        if str(review.get('employee_id') or review.get('employeeId', '')) == ds_id:
+        if (review.get('employee_id') or review.get('employeeId', '')) in match_ids:
             records.append({
                 'date': format_date(review.get('date') or review.get('created_at')),
                 'type': 'review',
@@ -169,7 +204,7 @@ def extract_records(
 
     # Goals
     for goal in data.get('goals', []):
-        if str(goal.get('employee_id') or goal.get('employeeId', '')) == ds_id:
+        if (goal.get('employee_id') or goal.get('employeeId', '')) in match_ids:
             records.append({
                 'date': format_date(goal.get('created_at') or goal.get('createdAt')),
                 'type': 'goal',
@@ -179,7 +214,7 @@ def extract_records(
 
     # Documents
     for doc in data.get('documents', []):
-        if str(doc.get('employee_id') or doc.get('employeeId', '')) == ds_id:
+        if (doc.get('employee_id') or doc.get('employeeId', '')) in match_ids:
             records.append({
                 'date': format_date(doc.get('uploaded_at') or doc.get('created_at')),
                 'type': 'document',
@@ -189,16 +224,16 @@ def extract_records(
 
     # Notes
     for note in data.get('notes', data.get('employee_notes', [])):
-        if str(note.get('employee_id') or note.get('employeeId', '')) == ds_id:
+        if (note.get('employee_id') or note.get('employeeId', '')) in match_ids:
             records.append({
                 'date': format_date(note.get('created_at') or note.get('date')),
                 'type': 'note',
                 'category': 'Notes',
-                'content': note.get('content') or note.get('body', ''),
+                'content': str(note.get('content') or note.get('body', '')),
             })
 
     # Sort by date
-    records.sort(key=lambda r: r.get('date', ''), reverse=True)
+    records.sort(key=itemgetter('date'), reverse=True)
     return records
 
 
@@ -212,8 +247,8 @@ def process(
     """Process a CharlieHR export for DSAR response."""
     start_time = time.time()
 
-    ensure_output_dir(output_dir)
-    ensure_output_dir(os.path.join(output_dir, 'internal'))
+    # Creating the internal directory creates output_dir along with it
+    internal_dir = ensure_output_dir(os.path.join(output_dir, 'internal'))
 
     log_event(
         'processing_started',
@@ -252,12 +287,12 @@ def process(
         print(f"  Found {len(records)} records for data subject")
 
         print("Applying redactions...")
-        redacted_records = []
-        for record in records:
-            redacted = record.copy()
-            if 'content' in redacted:
-                redacted['content'] = engine.redact(str(redacted['content']))
-            redacted_records.append(redacted)
+        # Records are built locally and not reused, so redact them in place
+        contents = engine.redact_many(record['content'] for record in records)
+        for record, content in zip(records, contents):
+            record['content'] = content
+        del contents
+        redacted_records = records
 
         safe_name = safe_filename(data_subject_name)
         timestamp = get_timestamp()
@@ -288,7 +323,7 @@ def process(
         json_path = os.path.join(output_dir, f"{VENDOR_NAME}_DSAR_{safe_name}_{timestamp}.json")
         save_json(json_data, json_path)
 
-        key_path = os.path.join(output_dir, 'internal', f"{VENDOR_NAME}_REDACTION_KEY_{safe_name}_{timestamp}.json")
+        key_path = os.path.join(internal_dir, f"{VENDOR_NAME}_REDACTION_KEY_{safe_name}_{timestamp}.json")
         save_json(engine.get_redaction_key(), key_path)
 
         stats = engine.get_stats()
@@ -13,8 +13,10 @@ Usage:
 import sys
 import os
 import time
+from functools import partial
+from operator import itemgetter
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AbstractSet
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -23,19 +25,59 @@ from core.docgen import create_vendor_report
 from core.utils import (
     setup_argparser,
     parse_extra_redactions,
-    load_json,
+    parse_output_formats,
+    OUTPUT_FORMATS,
+    load_json_collections,
     save_json,
     ensure_output_dir,
     safe_filename,
     format_date,
     get_timestamp,
     validate_data_subject_match,
+    run_concurrently,
+    find_name_matches,
     strip_html,
+    id_lookup_keys,
 )
 from core.activity_log import log_event
 
 VENDOR_NAME = "Greenhouse"
 
+# Top-level collections read from the export; anything else is skipped
+# while streaming so large exports stay bounded
+EXPORT_COLLECTIONS = (
+    'candidates', 'data',
+    'users', 'recruiters',
+    'jobs',
+    'applications',
+    'scheduled_interviews', 'interviews',
+    'scorecards',
+    'activity_feed', 'activities',
+    'notes',
+)
+
+
+def candidate_emails_of(candidate: Dict) -> List[str]:
+    """Return a candidate's email addresses, lowercased, in export order."""
+    candidate_emails = []
+    for e in candidate.get('email_addresses', candidate.get('emails', [])):
+        if isinstance(e, dict):
+            candidate_emails.append((e.get('value') or e.get('email') or '').lower())
+        elif isinstance(e, str):
+            candidate_emails.append(e.lower())
+    return candidate_emails
+
+
+def subject_match(candidate: Dict) -> Dict:
+    """Build the data subject match entry for a candidate."""
+    candidate_emails = candidate_emails_of(candidate)
+    return {
+        'id': candidate.get('id'),
+        'name': f"{candidate.get('first_name', '')} {candidate.get('last_name', '')}".strip(),
+        'email': candidate_emails[0] if candidate_emails else None,
+        'raw': candidate,
+    }
+
 
 def find_data_subject(
     data: Dict[str, Any],
@@ -44,36 +86,25 @@ def find_data_subject(
 ) -> Optional[Dict]:
     """Find the data subject in Greenhouse candidates."""
     candidates = data.get('candidates', data.get('data', []))
-    matches = []
     name_lower = name.lower()
-
-    for candidate in candidates:
-        emails = candidate.get('email_addresses', candidate.get('emails', []))
-        candidate_emails = []
-        for e in emails:
-            if isinstance(e, dict):
-                candidate_emails.append((e.get('value') or e.get('email') or '').lower())
-            elif isinstance(e, str):
-                candidate_emails.append(e.lower())
-
-        first_name = (candidate.get('first_name') or '').lower()
-        last_name = (candidate.get('last_name') or '').lower()
-        full_name = f"{first_name} {last_name}".strip()
-
-        is_match = False
-        if email and email.lower() in candidate_emails:
-            is_match = True
-        elif name_lower in full_name or full_name in name_lower:
-            is_match = True
-
-        if is_match:
-            primary_email = candidate_emails[0] if candidate_emails else None
-            matches.append({
-                'id': candidate.get('id'),
-                'name': f"{candidate.get('first_name', '')} {candidate.get('last_name', '')}".strip(),
-                'email': primary_email,
-                'raw': candidate,
-            })
+    email_lower = (email or '').lower()
+    hits = set()
+    full_names = []
+
+    for i, candidate in enumerate(candidates):
+        # find_name_matches lowercases the names itself, so they are kept as is
+        full_name = f"{candidate.get('first_name') or ''} {candidate.get('last_name') or ''}".strip()
+        # An empty name is contained in any other (and vice versa), which
+        # find_name_matches deliberately never reports
+        if not full_name or not name_lower:
+            hits.add(i)
+        elif email_lower and email_lower in candidate_emails_of(candidate):
+            hits.add(i)
+        full_names.append(full_name)
+
+    # All candidate names are scored in one batched call
+    hits.update(find_name_matches(name, full_names))
+    matches = [subject_match(candidates[i]) for i in sorted(hits)]
 
     return validate_data_subject_match(matches, name, email)
 
@@ -190,11 +221,14 @@ def extract_profile(data_subject: Dict) -> Dict[str, Any]:
 
 def extract_records(
     data: Dict[str, Any],
-    data_subject_id: str
+    data_subject_id: str,
+    candidate: Dict = None
 ) -> List[Dict]:
     """Extract all applications, interviews, and scorecards for the data subject."""
     records = []
     ds_id = str(data_subject_id)
+    # Rows are matched on their raw id, without coercing each one to a string
+    match_ids = id_lookup_keys(ds_id)
 
     # Build job lookup
     jobs = {}
@@ -203,28 +237,34 @@ def extract_records(
 
     # Applications
     for app in data.get('applications', []):
-        if str(app.get('candidate_id', '')) == ds_id or str(app.get('candidate', {}).get('id', '')) == ds_id:
+        if app.get('candidate_id', '') in match_ids or app.get('candidate', {}).get('id', '') in match_ids:
             job_name = jobs.get(str(app.get('job_id', '')), app.get('job', {}).get('name', 'Unknown'))
+            stage = app.get('current_stage', 'Unknown')
+            if isinstance(stage, dict):
+                stage = stage.get('name', 'Unknown')
+            source = app.get('source', 'Unknown')
+            if isinstance(source, dict):
+                source = source.get('public_name', 'Unknown')
 
             records.append({
                 'date': format_date(app.get('applied_at') or app.get('created_at')),
                 'type': 'application',
                 'category': f"Applications / {job_name}",
-                'content': f"Job: {job_name}\nStatus: {app.get('status')}\nStage: {app.get('current_stage', {}).get('name', 'Unknown') if isinstance(app.get('current_stage'), dict) else app.get('current_stage', 'Unknown')}\nSource: {app.get('source', {}).get('public_name', 'Unknown') if isinstance(app.get('source'), dict) else app.get('source', 'Unknown')}\nRejected: {app.get('rejected_at') or 'No'}",
+                'content': f"Job: {job_name}\nStatus: {app.get('status')}\nStage: {stage}\nSource: {source}\nRejected: {app.get('rejected_at') or 'No'}",
             })
 
     # Interviews/scheduled interviews
     for interview in data.get('scheduled_interviews', data.get('interviews', [])):
-        candidate_id = str(interview.get('candidate_id', ''))
         app = interview.get('application', {})
-        app_candidate_id = str(app.get('candidate_id', app.get('candidate', {}).get('id', '')))
+        app_candidate_id = app.get('candidate_id', app.get('candidate', {}).get('id', ''))
 
-        if candidate_id == ds_id or app_candidate_id == ds_id:
+        if interview.get('candidate_id', '') in match_ids or app_candidate_id in match_ids:
             interviewers = interview.get('interviewers', [])
             interviewer_names = ', '.join([i.get('name', '') for i in interviewers]) if interviewers else 'N/A'
+            start = interview.get('start')
 
             records.append({
-                'date': format_date(interview.get('start', {}).get('date_time') if isinstance(interview.get('start'), dict) else interview.get('scheduled_at')),
+                'date': format_date(start.get('date_time') if isinstance(start, dict) else interview.get('scheduled_at')),
                 'type': 'interview',
                 'category': 'Interviews',
                 'content': f"Interview: {interview.get('name', 'Interview')}\nStatus: {interview.get('status', 'scheduled')}\nInterviewers: {interviewer_names}\nLocation: {interview.get('location', 'N/A')}",
@@ -232,24 +272,25 @@ def extract_records(
 
     # Scorecards
     for scorecard in data.get('scorecards', []):
-        candidate_id = str(scorecard.get('candidate_id', ''))
         app = scorecard.get('application', {})
-        app_candidate_id = str(app.get('candidate_id', app.get('candidate', {}).get('id', '')))
+        app_candidate_id = app.get('candidate_id', app.get('candidate', {}).get('id', ''))
 
-        if candidate_id == ds_id or app_candidate_id == ds_id:
+        if scorecard.get('candidate_id', '') in match_ids or app_candidate_id in match_ids:
             attributes = scorecard.get('attributes', [])
             attr_str = '\n'.join([f"  - {a.get('name', '')}: {a.get('rating', '')} ({a.get('type', '')})" for a in attributes]) if attributes else 'N/A'
+            submitted_by = scorecard.get('submitted_by')
+            submitter = submitted_by.get('name', 'Unknown') if isinstance(submitted_by, dict) else 'Unknown'
 
             records.append({
                 'date': format_date(scorecard.get('submitted_at') or scorecard.get('created_at')),
                 'type': 'scorecard',
                 'category': 'Scorecards',
-                'content': f"Recommendation: {scorecard.get('overall_recommendation', 'N/A')}\nSubmitted By: {scorecard.get('submitted_by', {}).get('name', 'Unknown') if isinstance(scorecard.get('submitted_by'), dict) else 'Unknown'}\nAttributes:\n{attr_str}\nNotes: {strip_html(scorecard.get('interview_notes', '') or '')}",
+                'content': f"Recommendation: {scorecard.get('overall_recommendation', 'N/A')}\nSubmitted By: {submitter}\nAttributes:\n{attr_str}\nNotes: {strip_html(scorecard.get('interview_notes', '') or '')}",
             })
 
     # Activity feed/notes
     for activity in data.get('activity_feed', data.get('activities', [])):
-        if str(activity.get('candidate_id', '')) == ds_id:
+        if activity.get('candidate_id', '') in match_ids:
             records.append({
                 'date': format_date(activity.get('created_at')),
                 'type': activity.get('type', 'activity'),
@@ -259,18 +300,18 @@ def extract_records(
 
     # Notes
     for note in data.get('notes', []):
-        if str(note.get('candidate_id', '')) == ds_id:
+        if note.get('candidate_id', '') in match_ids:
+            user = note.get('user')
+            author = user.get('name', 'Unknown') if isinstance(user, dict) else 'Unknown'
             records.append({
                 'date': format_date(note.get('created_at')),
                 'type': 'note',
                 'category': 'Notes',
-                'content': f"Author: {note.get('user', {}).get('name', 'Unknown') if isinstance(note.get('user'), dict) else 'Unknown'}\nNote: {strip_html(note.get('body', ''))}",
+                'content': f"Author: {author}\nNote: {strip_html(note.get('body', ''))}",
             })
 
-    # Attachments/resumes
-    candidate_raw = data_subject.get('raw', {})
-    attachments = candidate_raw.get('attachments', [])
-    for attachment in attachments:
+    # Attachments/resumes (listed on the data subject's own candidate record)
+    for attachment in (candidate or {}).get('attachments', []):
         records.append({
             'date': format_date(attachment.get('created_at')),
             'type': attachment.get('type', 'attachment'),
@@ -279,7 +320,7 @@ def extract_records(
         })
 
     # Sort by date
-    records.sort(key=lambda r: r.get('date', ''), reverse=True)
+    records.sort(key=itemgetter('date'), reverse=True)
     return records
 
 
@@ -288,9 +329,15 @@ def process(
     data_subject_name: str,
     data_subject_email: str = None,
     extra_redactions: List[str] = None,
-    output_dir: str = './output'
+    output_dir: str = './output',
+    formats: AbstractSet[str] = OUTPUT_FORMATS
 ) -> tuple:
-    """Process a Greenhouse export for DSAR response."""
+    """
+    Process a Greenhouse export for DSAR response.
+
+    formats selects which reports to write ('docx', 'json'); the path of a
+    report that was not requested is returned as None.
+    """
     start_time = time.time()
 
     ensure_output_dir(output_dir)
@@ -307,7 +354,7 @@ def process(
 
     try:
         print(f"Loading Greenhouse export from {export_path}...")
-        data = load_json(export_path)
+        data = load_json_collections(export_path, EXPORT_COLLECTIONS)
 
         print(f"Searching for data subject: {data_subject_name}...")
         data_subject = find_data_subject(data, data_subject_name, data_subject_email)
@@ -318,8 +365,10 @@ def process(
         engine = RedactionEngine(data_subject_name, data_subject_email)
 
         users = extract_users(data)
-        for user_id, user_info in users.items():
-            engine.add_user(user_id, user_info.get('name'), user_info.get('email'))
+        engine.add_users_bulk(
+            (user_id, user_info.get('name'), user_info.get('email'))
+            for user_id, user_info in users.items()
+        )
         print(f"  Mapped {engine.get_total_redactions()} users for redaction")
 
         for name in (extra_redactions or []):
@@ -329,54 +378,62 @@ def process(
         profile = extract_profile(data_subject)
 
         print("Extracting activity records...")
-        records = extract_records(data, ds_id)
+        records = extract_records(data, ds_id, data_subject.get('raw', {}))
         print(f"  Found {len(records)} records for data subject")
 
         print("Applying redactions...")
-        redacted_records = []
-        for record in records:
-            redacted = record.copy()
-            if 'content' in redacted:
-                redacted['content'] = engine.redact(str(redacted['content']))
-            redacted_records.append(redacted)
+        # Records are built locally and not reused, so redact them in place
+        contents = engine.redact_many(str(record['content']) for record in records)
+        for record, content in zip(records, contents):
+            record['content'] = content
+        del contents
+        redacted_records = records
 
         safe_name = safe_filename(data_subject_name)
         timestamp = get_timestamp()
 
-        print("Generating Word report...")
-        doc = create_vendor_report(
-            vendor_name=VENDOR_NAME,
-            data_subject_name=data_subject_name,
-            data_subject_email=data_subject_email,
-            profile_data=profile,
-            records=redacted_records,
-            redaction_stats=engine.get_stats(),
-            export_filename=os.path.basename(export_path)
-        )
-        docx_path = os.path.join(output_dir, f"{VENDOR_NAME}_DSAR_{safe_name}_{timestamp}.docx")
-        doc.save(docx_path)
-
-        print("Generating JSON export...")
-        json_data = {
-            'vendor': VENDOR_NAME,
-            'data_subject': data_subject_name,
-            'email': data_subject_email,
-            'generated': datetime.now().isoformat(),
-            'profile': profile,
-            'records': redacted_records,
-            'record_count': len(redacted_records),
-        }
-        json_path = os.path.join(output_dir, f"{VENDOR_NAME}_DSAR_{safe_name}_{timestamp}.json")
-        save_json(json_data, json_path)
-
         key_path = os.path.join(output_dir, 'internal', f"{VENDOR_NAME}_REDACTION_KEY_{safe_name}_{timestamp}.json")
-        save_json(engine.get_redaction_key(), key_path)
+        # The outputs are independent; write them concurrently
+        writes = [partial(save_json, engine.get_redaction_key(), key_path)]
+
+        docx_path = None
+        if 'docx' in formats:
+            print("Generating Word report...")
+            doc = create_vendor_report(
+                vendor_name=VENDOR_NAME,
+                data_subject_name=data_subject_name,
+                data_subject_email=data_subject_email,
+                profile_data=profile,
+                records=redacted_records,
+                redaction_stats=engine.get_stats(),
+                export_filename=os.path.basename(export_path)
+            )
+            docx_path = os.path.join(output_dir, f"{VENDOR_NAME}_DSAR_{safe_name}_{timestamp}.docx")
+            writes.append(partial(doc.save, docx_path))
+
+        json_path = None
+        if 'json' in formats:
+            print("Generating JSON export...")
+            json_data = {
+                'vendor': VENDOR_NAME,
+                'data_subject': data_subject_name,
+                'email': data_subject_email,
+                'generated': datetime.now().isoformat(),
+                'profile': profile,
+                'records': redacted_records,
+                'record_count': len(redacted_records),
+            }
+            json_path = os.path.join(output_dir, f"{VENDOR_NAME}_DSAR_{safe_name}_{timestamp}.json")
+            writes.append(partial(save_json, json_data, json_path))
+
+        run_concurrently(*writes)
+        report_paths = [path for path in (docx_path, json_path) if path]
 
         stats = engine.get_stats()
         print(f"\n✓ {VENDOR_NAME}: {len(redacted_records)} records processed")
         print(f"  Redacted: {stats['user']} users, {stats['external']} external")
-        print(f"  → {docx_path}")
-        print(f"  → {json_path}")
+        for path in report_paths:
+            print(f"  → {path}")
 
         elapsed = time.time() - start_time
         log_event(
@@ -389,7 +446,7 @@ def process(
             records_found=len(records),
             records_processed=len(redacted_records),
             redaction_stats=stats,
-            files_generated=[os.path.basename(docx_path), os.path.basename(json_path)],
+            files_generated=[os.path.basename(path) for path in report_paths],
             execution_time_seconds=round(elapsed, 2),
         )
 
@@ -411,7 +468,7 @@ def process(
 
 
 if __name__ == '__main__':
-    parser = setup_argparser(VENDOR_NAME)
+    parser = setup_argparser(VENDOR_NAME, with_formats=True)
     args = parser.parse_args()
 
     try:
@@ -420,7 +477,8 @@ if __name__ == '__main__':
             data_subject_name=args.data_subject_name,
             data_subject_email=args.email,
             extra_redactions=parse_extra_redactions(args.redact),
-            output_dir=args.output
+            output_dir=args.output,
+            formats=parse_output_formats(args.format)
         )
     except Exception as e:
         print(f"Error: {e}")
@@ -13,8 +13,10 @@ Usage:
 import sys
 import os
 import time
+from functools import partial
+from operator import itemgetter
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AbstractSet
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -23,18 +25,45 @@ from core.docgen import create_vendor_report
 from core.utils import (
     setup_argparser,
     parse_extra_redactions,
-    load_json,
+    parse_output_formats,
+    OUTPUT_FORMATS,
+    load_json_collections,
     save_json,
     ensure_output_dir,
     safe_filename,
     format_date,
     get_timestamp,
     validate_data_subject_match,
+    run_concurrently,
+    find_name_matches,
+    id_lookup_keys,
 )
 from core.activity_log import log_event
 
 VENDOR_NAME = "Okta"
 
+# Top-level collections read from the export; anything else is skipped
+# while streaming so large exports stay bounded
+EXPORT_COLLECTIONS = (
+    'users', 'data',
+    'appUsers', 'app_assignments',
+    'groupMemberships', 'group_memberships',
+    'factors', 'enrolled_factors',
+    'logs', 'system_logs',
+    'sessions',
+)
+
+
+def subject_match(user: Dict) -> Dict:
+    """Build the data subject match entry for an Okta user."""
+    profile = user.get('profile', user)
+    return {
+        'id': user.get('id'),
+        'name': f"{profile.get('firstName', '')} {profile.get('lastName', '')}".strip(),
+        'email': profile.get('email') or profile.get('login'),
+        'raw': user,
+    }
+
 
 def find_data_subject(
     data: Dict[str, Any],
@@ -43,32 +72,31 @@ def find_data_subject(
 ) -> Optional[Dict]:
     """Find the data subject in Okta users."""
     users = data.get('users', data.get('data', []))
-    matches = []
     name_lower = name.lower()
+    email_lower = (email or '').lower()
+    hits = set()
+    full_names = []
+    display_names = []
 
-    for user in users:
+    for i, user in enumerate(users):
         profile = user.get('profile', user)
-        user_email = (profile.get('email') or profile.get('login') or '').lower()
-        first_name = (profile.get('firstName') or profile.get('first_name') or '').lower()
-        last_name = (profile.get('lastName') or profile.get('last_name') or '').lower()
+        # find_name_matches lowercases the names itself, so they are kept as is
+        first_name = profile.get('firstName') or profile.get('first_name') or ''
+        last_name = profile.get('lastName') or profile.get('last_name') or ''
         full_name = f"{first_name} {last_name}".strip()
-        display_name = (profile.get('displayName') or '').lower()
-
-        is_match = False
-        if email and user_email == email.lower():
-            is_match = True
-        elif name_lower in full_name or full_name in name_lower:
-            is_match = True
-        elif display_name and (name_lower in display_name or display_name in name_lower):
-            is_match = True
-
-        if is_match:
-            matches.append({
-                'id': user.get('id'),
-                'name': f"{profile.get('firstName', '')} {profile.get('lastName', '')}".strip(),
-                'email': profile.get('email') or profile.get('login'),
-                'raw': user,
-            })
+        # An empty name is contained in any other (and vice versa), which
+        # find_name_matches deliberately never reports
+        if not full_name or not name_lower:
+            hits.add(i)
+        elif email_lower and (profile.get('email') or profile.get('login') or '').lower() == email_lower:
+            hits.add(i)
+        full_names.append(full_name)
+        display_names.append(profile.get('displayName'))
+
+    # Both name columns are scored in one batched call each
+    hits.update(find_name_matches(name, full_names))
+    hits.update(find_name_matches(name, display_names))
+    matches = [subject_match(users[i]) for i in sorted(hits)]
 
     return validate_data_subject_match(matches, name, email)
 
@@ -149,11 +177,13 @@ def extract_records(
     """Extract all app assignments, logs, and factors for the data subject."""
     records = []
     ds_id = str(data_subject_id)
+    # Rows are matched on their raw id, without coercing each one to a string
+    match_ids = id_lookup_keys(ds_id)
     ds_email_lower = (data_subject_email or '').lower()
 
     # App assignments
     for assignment in data.get('appUsers', data.get('app_assignments', [])):
-        if str(assignment.get('userId') or assignment.get('user_id', '')) == ds_id:
+        if (assignment.get('userId') or assignment.get('user_id', '')) in match_ids:
             records.append({
                 'date': format_date(assignment.get('created')),
                 'type': 'app_assignment',
@@ -163,7 +193,7 @@ def extract_records(
 
     # Group memberships
     for membership in data.get('groupMemberships', data.get('group_memberships', [])):
-        if str(membership.get('userId') or membership.get('user_id', '')) == ds_id:
+        if (membership.get('userId') or membership.get('user_id', '')) in match_ids:
             records.append({
                 'date': format_date(membership.get('created') or membership.get('lastMembershipUpdated')),
                 'type': 'group_membership',
@@ -173,7 +203,7 @@ def extract_records(
 
     # MFA factors
     for factor in data.get('factors', data.get('enrolled_factors', [])):
-        if str(factor.get('userId') or factor.get('user_id', '')) == ds_id:
+        if (factor.get('userId') or factor.get('user_id', '')) in match_ids:
             records.append({
                 'date': format_date(factor.get('created')),
                 'type': 'mfa_factor',
@@ -181,33 +211,34 @@ def extract_records(
                 'content': f"Factor Type: {factor.get('factorType', factor.get('type', 'unknown'))}\nProvider: {factor.get('provider', 'OKTA')}\nStatus: {factor.get('status', 'ACTIVE')}\nDevice: {factor.get('profile', {}).get('deviceType', 'N/A')}",
             })
 
-    # System logs (audit events)
+    # System logs (audit events); the defaults are shared, never mutated
+    no_actor = {}
+    no_targets = ()
     for log in data.get('logs', data.get('system_logs', [])):
         # Check if user is actor or target
-        actor = log.get('actor', {})
-        targets = log.get('target', [])
+        actor = log.get('actor', no_actor)
+        targets = log.get('target', no_targets)
 
-        actor_id = actor.get('id', '')
-        actor_email = (actor.get('alternateId', '') or '').lower()
-        target_ids = [t.get('id', '') for t in targets]
-
-        is_involved = (str(actor_id) == ds_id or
-                       actor_email == ds_email_lower or
-                       ds_id in [str(t) for t in target_ids])
+        # Stops at the first hit, without building per-log id lists. Without
+        # an email, an actor with no alternateId is not the data subject
+        is_involved = (actor.get('id', '') in match_ids or
+                       (ds_email_lower and (actor.get('alternateId') or '').lower() == ds_email_lower) or
+                       any(t.get('id', '') in match_ids for t in targets))
 
         if is_involved:
+            client = log.get('client', {})
             target_info = ', '.join([f"{t.get('type', 'Unknown')}: {t.get('displayName', t.get('alternateId', 'Unknown'))}" for t in targets[:3]])
 
             records.append({
                 'date': format_date(log.get('published')),
                 'type': log.get('eventType', 'event'),
                 'category': 'Audit Logs',
-                'content': f"Event: {log.get('displayMessage', log.get('eventType', 'Unknown'))}\nOutcome: {log.get('outcome', {}).get('result', 'UNKNOWN')}\nClient IP: {log.get('client', {}).get('ipAddress', 'N/A')}\nUser Agent: {log.get('client', {}).get('userAgent', {}).get('rawUserAgent', 'N/A')[:100]}\nTargets: {target_info or 'N/A'}",
+                'content': f"Event: {log.get('displayMessage', log.get('eventType', 'Unknown'))}\nOutcome: {log.get('outcome', {}).get('result', 'UNKNOWN')}\nClient IP: {client.get('ipAddress', 'N/A')}\nUser Agent: {client.get('userAgent', {}).get('rawUserAgent', 'N/A')[:100]}\nTargets: {target_info or 'N/A'}",
             })
 
     # Sessions
     for session in data.get('sessions', []):
-        if str(session.get('userId', '')) == ds_id:
+        if session.get('userId', '') in match_ids:
             records.append({
                 'date': format_date(session.get('createdAt')),
                 'type': 'session',
@@ -216,7 +247,7 @@ def extract_records(
             })
 
     # Sort by date
-    records.sort(key=lambda r: r.get('date', ''), reverse=True)
+    records.sort(key=itemgetter('date'), reverse=True)
     return records
 
 
@@ -225,9 +256,15 @@ def process(
     data_subject_name: str,
     data_subject_email: str = None,
     extra_redactions: List[str] = None,
-    output_dir: str = './output'
+    output_dir: str = './output',
+    formats: AbstractSet[str] = OUTPUT_FORMATS
 ) -> tuple:
-    """Process an Okta export for DSAR response."""
+    """
+    Process an Okta export for DSAR response.
+
+    formats selects which reports to write ('docx', 'json'); the path of a
+    report that was not requested is returned as None.
+    """
     start_time = time.time()
 
     ensure_output_dir(output_dir)
@@ -244,7 +281,7 @@ def process(
 
     try:
         print(f"Loading Okta export from {export_path}...")
-        data = load_json(export_path)
+        data = load_json_collections(export_path, EXPORT_COLLECTIONS)
 
         print(f"Searching for data subject: {data_subject_name}...")
         data_subject = find_data_subject(data, data_subject_name, data_subject_email)
@@ -255,8 +292,10 @@ def process(
         engine = RedactionEngine(data_subject_name, data_subject_email)
 
         users = extract_users(data)
-        for user_id, user_info in users.items():
-            engine.add_user(user_id, user_info.get('name'), user_info.get('email'))
+        engine.add_users_bulk(
+            (user_id, user_info.get('name'), user_info.get('email'))
+            for user_id, user_info in users.items()
+        )
         print(f"  Mapped {engine.get_total_redactions()} users for redaction")
 
         for name in (extra_redactions or []):
@@ -270,50 +309,58 @@ def process(
         print(f"  Found {len(records)} records for data subject")
 
         print("Applying redactions...")
-        redacted_records = []
-        for record in records:
-            redacted = record.copy()
-            if 'content' in redacted:
-                redacted['content'] = engine.redact(str(redacted['content']))
-            redacted_records.append(redacted)
+        # Records are built locally and not reused, so redact them in place
+        contents = engine.redact_many(str(record['content']) for record in records)
+        for record, content in zip(records, contents):
+            record['content'] = content
+        del contents
+        redacted_records = records
 
         safe_name = safe_filename(data_subject_name)
         timestamp = get_timestamp()
 
-        print("Generating Word report...")
-        doc = create_vendor_report(
-            vendor_name=VENDOR_NAME,
-            data_subject_name=data_subject_name,
-            data_subject_email=data_subject_email,
-            profile_data=profile,
-            records=redacted_records,
-            redaction_stats=engine.get_stats(),
-            export_filename=os.path.basename(export_path)
-        )
-        docx_path = os.path.join(output_dir, f"{VENDOR_NAME}_DSAR_{safe_name}_{timestamp}.docx")
-        doc.save(docx_path)
-
-        print("Generating JSON export...")
-        json_data = {
-            'vendor': VENDOR_NAME,
-            'data_subject': data_subject_name,
-            'email': data_subject_email,
-            'generated': datetime.now().isoformat(),
-            'profile': profile,
-            'records': redacted_records,
-            'record_count': len(redacted_records),
-        }
-        json_path = os.path.join(output_dir, f"{VENDOR_NAME}_DSAR_{safe_name}_{timestamp}.json")
-        save_json(json_data, json_path)
-
         key_path = os.path.join(output_dir, 'internal', f"{VENDOR_NAME}_REDACTION_KEY_{safe_name}_{timestamp}.json")
-        save_json(engine.get_redaction_key(), key_path)
+        # The outputs are independent; write them concurrently
+        writes = [partial(save_json, engine.get_redaction_key(), key_path)]
+
+        docx_path = None
+        if 'docx' in formats:
+            print("Generating Word report...")
+            doc = create_vendor_report(
+                vendor_name=VENDOR_NAME,
+                data_subject_name=data_subject_name,
+                data_subject_email=data_subject_email,
+                profile_data=profile,
+                records=redacted_records,
+                redaction_stats=engine.get_stats(),
+                export_filename=os.path.basename(export_path)
+            )
+            docx_path = os.path.join(output_dir, f"{VENDOR_NAME}_DSAR_{safe_name}_{timestamp}.docx")
+            writes.append(partial(doc.save, docx_path))
+
+        json_path = None
+        if 'json' in formats:
+            print("Generating JSON export...")
+            json_data = {
+                'vendor': VENDOR_NAME,
+                'data_subject': data_subject_name,
+                'email': data_subject_email,
+                'generated': datetime.now().isoformat(),
+                'profile': profile,
+                'records': redacted_records,
+                'record_count': len(redacted_records),
+            }
+            json_path = os.path.join(output_dir, f"{VENDOR_NAME}_DSAR_{safe_name}_{timestamp}.json")
+            writes.append(partial(save_json, json_data, json_path))
+
+        run_concurrently(*writes)
+        report_paths = [path for path in (docx_path, json_path) if path]
 
         stats = engine.get_stats()
         print(f"\n✓ {VENDOR_NAME}: {len(redacted_records)} records processed")
         print(f"  Redacted: {stats['user']} users, {stats['external']} external")
-        print(f"  → {docx_path}")
-        print(f"  → {json_path}")
+        for path in report_paths:
+            print(f"  → {path}")
 
         elapsed = time.time() - start_time
         log_event(
@@ -326,7 +373,7 @@ def process(
             records_found=len(records),
             records_processed=len(redacted_records),
             redaction_stats=stats,
-            files_generated=[os.path.basename(docx_path), os.path.basename(json_path)],
+            files_generated=[os.path.basename(path) for path in report_paths],
             execution_time_seconds=round(elapsed, 2),
         )
 
@@ -348,7 +395,7 @@ def process(
 
 
 if __name__ == '__main__':
-    parser = setup_argparser(VENDOR_NAME)
+    parser = setup_argparser(VENDOR_NAME, with_formats=True)
     args = parser.parse_args()
 
     try:
@@ -357,7 +404,8 @@ if __name__ == '__main__':
             data_subject_name=args.data_subject_name,
             data_subject_email=args.email,
             extra_redactions=parse_extra_redactions(args.redact),
-            output_dir=args.output
+            output_dir=args.output,
+            formats=parse_output_formats(args.format)
         )
     except Exception as e:
         print(f"Error: {e}")
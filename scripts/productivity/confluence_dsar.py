@@ -177,7 +177,7 @@ def extract_records(
         content = ''
         if isinstance(body, dict):
             storage = body.get('storage', body.get('view', {}))
-            content = strip_html(storage.get('value', '') if isinstance(storage, dict) else str(storage))[:500]
+            content = strip_html(storage.get('value', '') if isinstance(storage, dict) else str(storage), 500)
 
         title = page.get('title', '')
         is_creator = created_by_id == ds_id
@@ -238,7 +238,7 @@ def extract_records(
         content = ''
         if isinstance(body, dict):
             storage = body.get('storage', body.get('view', {}))
-            content = strip_html(storage.get('value', '') if isinstance(storage, dict) else str(storage))[:500]
+            content = strip_html(storage.get('value', '') if isinstance(storage, dict) else str(storage), 500)
 
         title = blog.get('title', '')
         is_creator = created_by_id == ds_id
@@ -39,6 +39,7 @@ from core.utils import (
     get_timestamp,
     validate_data_subject_match,
     strip_html,
+    json_loads,
 )
 from core.activity_log import log_event
 
@@ -200,7 +201,7 @@ def load_takeout_zip(zip_path: str) -> Dict[str, Any]:
         for name in zf.namelist():
             try:
                 if name.endswith('.json'):
-                    content = json.loads(zf.read(name).decode('utf-8'))
+                    content = json_loads(zf.read(name))
 
                     # Profile info
                     if 'Profile' in name or 'profile' in name:
@@ -424,7 +425,7 @@ def extract_records(
                 'date': format_date(event.get('created') or start_time),
                 'type': 'calendar_event',
                 'category': 'Google Calendar',
-                'content': f"Event: {event.get('summary', 'Untitled')}\nStart: {format_date(start_time)}\nEnd: {format_date(end_time)}\nLocation: {event.get('location', 'N/A')}\nAttendees: {attendee_list or 'N/A'}\nDescription: {strip_html(event.get('description', '') or '')[:300]}",
+                'content': f"Event: {event.get('summary', 'Untitled')}\nStart: {format_date(start_time)}\nEnd: {format_date(end_time)}\nLocation: {event.get('location', 'N/A')}\nAttendees: {attendee_list or 'N/A'}\nDescription: {strip_html(event.get('description', '') or '', 300)}",
             })
 
     # Chat messages
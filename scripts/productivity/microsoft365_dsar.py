@@ -34,6 +34,7 @@ from core.utils import (
     get_timestamp,
     validate_data_subject_match,
     strip_html,
+    json_loads,
 )
 from core.activity_log import log_event
 
@@ -65,7 +66,7 @@ def load_m365_zip(zip_path: str) -> Dict[str, Any]:
         for name in zf.namelist():
             try:
                 if name.endswith('.json'):
-                    content = json.loads(zf.read(name).decode('utf-8'))
+                    content = json_loads(zf.read(name))
                     basename = os.path.basename(name).lower()
 
                     # User profile
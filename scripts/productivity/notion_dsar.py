@@ -34,6 +34,7 @@ from core.utils import (
     get_timestamp,
     validate_data_subject_match,
     strip_html,
+    json_loads,
 )
 from core.activity_log import log_event
 
@@ -61,7 +62,7 @@ def load_zip_export(zip_path: str) -> Dict[str, Any]:
         for name in zf.namelist():
             if name.endswith('.json'):
                 try:
-                    content = json.loads(zf.read(name).decode('utf-8'))
+                    content = json_loads(zf.read(name))
                     if isinstance(content, dict):
                         if 'users' in content:
                             data['users'].extend(content['users'])
@@ -184,7 +184,7 @@ def extract_records(
                     'date': format_date(card.get('dateLastActivity')),
                     'type': 'card',
                     'category': f"{board_name} / {list_name}",
-                    'content': f"Card: {card.get('name')}\nRole: {', '.join(role)}\nDue: {format_date(card.get('due')) or 'No due date'}\nDescription: {strip_html(card.get('desc', '') or '')[:500]}",
+                    'content': f"Card: {card.get('name')}\nRole: {', '.join(role)}\nDue: {format_date(card.get('due')) or 'No due date'}\nDescription: {strip_html(card.get('desc', '') or '', 500)}",
                 })
 
     # Also check standalone cards list
@@ -207,7 +207,7 @@ def extract_records(
                 'date': format_date(card.get('dateLastActivity')),
                 'type': 'card',
                 'category': f"{board_name} / {list_name}",
-                'content': f"Card: {card.get('name')}\nRole: {', '.join(role)}\nDue: {format_date(card.get('due')) or 'No due date'}\nDescription: {strip_html(card.get('desc', '') or '')[:500]}",
+                'content': f"Card: {card.get('name')}\nRole: {', '.join(role)}\nDue: {format_date(card.get('due')) or 'No due date'}\nDescription: {strip_html(card.get('desc', '') or '', 500)}",
             })
 
     # Comments/actions
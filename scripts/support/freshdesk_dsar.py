@@ -168,7 +168,7 @@ def extract_records(
                 'date': format_date(ticket.get('created_at')),
                 'type': 'ticket',
                 'category': f"Ticket #{ticket.get('id')}",
-                'content': f"Subject: {ticket.get('subject')}\nStatus: {status}\nPriority: {priority}\nType: {ticket.get('type', 'N/A')}\nSource: {ticket.get('source', 'N/A')}\nDescription: {strip_html(ticket.get('description_text', ticket.get('description', '')) or '')[:500]}",
+                'content': f"Subject: {ticket.get('subject')}\nStatus: {status}\nPriority: {priority}\nType: {ticket.get('type', 'N/A')}\nSource: {ticket.get('source', 'N/A')}\nDescription: {strip_html(ticket.get('description_text', ticket.get('description', '')) or '', 500)}",
             })
 
     # Conversations/replies
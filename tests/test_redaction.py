@@ -8,6 +8,7 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
 
+import core.redaction
 from core.redaction import RedactionEngine
 
 
@@ -90,6 +91,30 @@ class TestAddUser:
         assert "Jane Doe" in engine.redaction_map
         assert "jane@example.com" in engine.redaction_map
 
+    def test_add_user_maps_aliases_to_same_label(self):
+        engine = RedactionEngine("John Smith")
+        label = engine.add_user("42", "Jane Doe", aliases=["janedoe"])
+        assert engine.redaction_map["janedoe"] == label
+        assert engine.add_user("janedoe", "janedoe") == label
+        assert engine.get_total_redactions() == 1
+
+
+class TestAddUsersBulk:
+    """Tests for adding users from an iterable."""
+
+    def test_add_users_bulk_accepts_generator(self):
+        engine = RedactionEngine("John Smith", "john@example.com")
+        users = (u for u in [
+            ("u1", "Jane Doe", "jane@example.com"),
+            ("u2", "John Smith", "john@example.com"),
+            ("u3", "Bob Wilson", None, ["bwilson"]),
+        ])
+        engine.add_users_bulk(users)
+        assert "Jane Doe" in engine.redaction_map
+        assert "John Smith" not in engine.redaction_map
+        assert engine.redaction_map["bwilson"] == engine.redaction_map["u3"]
+        assert engine.get_total_redactions() == 2
+
 
 class TestAddExternal:
     """Tests for adding external names."""
@@ -177,6 +202,50 @@ class TestRedact:
         result = engine.redact("")
         assert result == ""
 
+    def test_redact_picks_up_users_added_after_first_call(self):
+        engine = RedactionEngine("John Smith")
+        jane = engine.add_user("u1", "Jane Doe")
+        assert engine.redact("Jane Doe and Bob Wilson") == f"{jane} and Bob Wilson"
+        bob = engine.add_user("u2", "Bob Wilson")
+        assert engine.redact("Jane Doe and Bob Wilson") == f"{jane} and {bob}"
+
+    def test_redact_does_not_rematch_inside_labels(self):
+        engine = RedactionEngine("John Smith")
+        jane = engine.add_user("u1", "Jane Doe")
+        engine.add_external("user")
+        assert engine.redact("Jane Doe") == jane
+
+    def test_redact_without_automaton(self, monkeypatch):
+        monkeypatch.setattr(core.redaction, "ahocorasick", None)
+        engine = RedactionEngine("John Smith")
+        jane = engine.add_user("u1", "Jane Doe")
+        bob = engine.add_user("u2", "Bob")
+        ext = engine.add_external("user")
+        result = engine.redact("JANE DOE met Bob and a User")
+        assert result == f"{jane} met {bob} and a {ext}"
+
+    def test_redact_many_matches_redact(self):
+        engine = RedactionEngine("John Smith")
+        engine.add_user("u1", "Jane Doe", "jane@example.com")
+        texts = ["Hello Jane Doe", "Mail jane@example.com", ""]
+        assert engine.redact_many(iter(texts)) == [engine.redact(t) for t in texts]
+
+    def test_redact_many_keeps_separator_in_texts(self):
+        engine = RedactionEngine("John Smith")
+        engine.add_user("u1", "Jane Doe")
+        texts = ["Jane Doe\x1eJane Doe", "Hello Jane Doe"]
+        assert engine.redact_many(texts) == [engine.redact(t) for t in texts]
+
+    def test_redact_many_large_batch_matches_redact(self):
+        engine = RedactionEngine("John Smith")
+        for i in range(50):
+            engine.add_user(f"u{i}", f"User{i} Person", f"user{i}@example.com")
+        texts = [
+            f"Note {i}: USER{i % 60} person mailed user{i % 70}@example.com"
+            for i in range(5000)
+        ]
+        assert engine.redact_many(texts) == [engine.redact(t) for t in texts]
+
 
 class TestGetRedactionKey:
     """Tests for redaction key generation."""
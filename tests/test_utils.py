@@ -8,20 +8,32 @@ import os
 import json
 import tempfile
 import csv
+from datetime import datetime
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
 
 from core.utils import (
     safe_filename,
     format_date,
+    extract_fields,
+    join_fields,
+    id_lookup_keys,
     get_timestamp,
     strip_html,
+    json_loads,
     load_json,
+    load_json_collections,
     save_json,
+    run_concurrently,
     load_csv,
+    iter_csv_rows,
+    detect_csv_encoding,
     ensure_output_dir,
     validate_data_subject_match,
+    find_name_matches,
     AmbiguousMatchError,
+    parse_output_formats,
+    OUTPUT_FORMATS,
 )
 
 
@@ -76,6 +88,66 @@ class TestFormatDate:
         assert result == "not-a-date"
 
 
+class TestExtractFields:
+    """Tests for extract_fields function."""
+
+    def test_maps_keys_in_schema_order(self):
+        fields = (('Name', 'name'), ('Missing', 'nope'), ('Full', lambda r: r['name'].upper()))
+        result = extract_fields({'name': 'jane'}, fields)
+        assert list(result.items()) == [('Name', 'jane'), ('Missing', None), ('Full', 'JANE')]
+
+    def test_applies_formatter(self):
+        result = extract_fields({'created': '2024-01-15'}, (('Created', 'created', format_date),))
+        assert result == {'Created': '2024-01-15 00:00'}
+
+    def test_key_aliases_fall_back_like_or(self):
+        fields = (('Email', ('workEmail', 'email')),)
+        for raw in [{'workEmail': 'a@x.com', 'email': 'b@x.com'}, {'workEmail': '', 'email': 'b@x.com'},
+                    {'email': ''}, {}]:
+            assert extract_fields(raw, fields)['Email'] == (raw.get('workEmail') or raw.get('email'))
+
+
+class TestJoinFields:
+    """Tests for join_fields function."""
+
+    def test_skips_empty_values(self):
+        raw = {'address1': '1 High St', 'address2': '', 'city': 'Leeds', 'zip': 12345}
+        assert join_fields(raw, ('address1', 'address2', 'city', ('zipcode', 'zip'))) == '1 High St Leeds 12345'
+
+    def test_all_empty(self):
+        assert join_fields({'city': None}, ('address1', 'city')) == ''
+
+
+class TestParseOutputFormats:
+    """Tests for parse_output_formats function."""
+
+    def test_default_is_all_formats(self):
+        assert parse_output_formats(None) == OUTPUT_FORMATS
+        assert parse_output_formats('') == OUTPUT_FORMATS
+
+    def test_parses_list(self):
+        assert parse_output_formats('json') == {'json'}
+        assert parse_output_formats(' DOCX , json ') == {'docx', 'json'}
+
+    def test_rejects_unknown(self):
+        with pytest.raises(ValueError):
+            parse_output_formats('json,pdf')
+
+
+class TestIdLookupKeys:
+    """Tests for id_lookup_keys function."""
+
+    def test_includes_int_form(self):
+        keys = id_lookup_keys("42")
+        assert "42" in keys
+        assert 42 in keys
+
+    def test_matches_str_comparison(self):
+        for raw in [42, "42", "042", -7, "-7", "abc", "", 42.0, 1, True, [1], {"id": 1}, None]:
+            for ds_id in ["42", "042", "-7", "abc", "", "1", "True", "42.0", "None"]:
+                assert (raw in id_lookup_keys(ds_id)) == (str(raw) == ds_id)
+
+
 class TestGetTimestamp:
     """Tests for get_timestamp function."""
 
@@ -104,6 +176,9 @@ class TestStripHtml:
         result = strip_html("Plain text")
         assert result == "Plain text"
 
+    def test_plain_text_collapses_blank_lines(self):
+        assert strip_html("  one\n\n\n\ntwo\n ") == "one\n\ntwo"
+
     def test_handles_empty(self):
         result = strip_html("")
         assert result == ""
@@ -116,6 +191,15 @@ class TestStripHtml:
         result = strip_html("&amp; &lt; &gt;")
         assert "&" in result
 
+    def test_max_length_matches_slicing_result(self):
+        texts = [
+            "<p>" + "word " * 500 + "</p>",
+            "x" * 1990 + '<a href="' + "y" * 100 + '">link</a>' + "z" * 300,
+            "a &lt; b" * 400 + "<br>" * 200,
+        ]
+        for text in texts:
+            assert strip_html(text, 200) == strip_html(text)[:200]
+
 
 class TestLoadJson:
     """Tests for load_json function."""
@@ -136,11 +220,77 @@ class TestLoadJson:
                 load_json(f.name)
         os.unlink(f.name)
 
+    def test_matches_stdlib_on_nan_and_wide_integers(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            f.write('{"id": 123456789012345678901234567890, "score": NaN}')
+            f.flush()
+            result = load_json(f.name)
+        os.unlink(f.name)
+        assert result['id'] == 123456789012345678901234567890
+        assert result['score'] != result['score']
+
     def test_raises_on_missing_file(self):
         with pytest.raises(FileNotFoundError):
             load_json("/nonexistent/file.json")
 
 
+class TestJsonLoads:
+    """Tests for json_loads function."""
+
+    def test_parses_bytes(self):
+        assert json_loads(b'{"name": "J\xc3\xa9r\xc3\xb4me"}') == {"name": "Jérôme"}
+
+    def test_parses_str(self):
+        assert json_loads('[1, 2, 3]') == [1, 2, 3]
+
+    def test_raises_json_decode_error(self):
+        with pytest.raises(json.JSONDecodeError):
+            json_loads(b'{invalid')
+
+    def test_accepts_nan_and_infinity(self):
+        result = json_loads(b'{"a": NaN, "b": Infinity}')
+        assert result['a'] != result['a']
+        assert result['b'] == float('inf')
+
+    def test_keeps_wide_integers(self):
+        assert json_loads(b'{"id": 123456789012345678901234567890}') == {"id": 123456789012345678901234567890}
+        assert json_loads('[-9223372036854775809]') == [-9223372036854775809]
+
+
+class TestLoadJsonCollections:
+    """Tests for load_json_collections function."""
+
+    def test_keeps_only_requested_keys(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump({"Contact": [{"Id": "1", "Amount": 1.5}], "Account": [{"Id": "2"}]}, f)
+            f.flush()
+            result = load_json_collections(f.name, ["Contact", "User"])
+        os.unlink(f.name)
+        assert result == {"Contact": [{"Id": "1", "Amount": 1.5}]}
+
+    def test_raises_on_invalid_json(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            f.write("{invalid json")
+            f.flush()
+            with pytest.raises(json.JSONDecodeError):
+                load_json_collections(f.name, ["Contact"])
+        os.unlink(f.name)
+
+    def test_matches_stdlib_on_nan_and_wide_integers(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            f.write('{"Contact": [{"Id": 123456789012345678901234567890, "Score": NaN}], "Account": []}')
+            f.flush()
+            result = load_json_collections(f.name, ["Contact"])
+        os.unlink(f.name)
+        contact = result["Contact"][0]
+        assert contact["Id"] == 123456789012345678901234567890
+        assert contact["Score"] != contact["Score"]
+
+    def test_raises_on_missing_file(self):
+        with pytest.raises(FileNotFoundError):
+            load_json_collections("/nonexistent/file.json", ["Contact"])
+
+
 class TestSaveJson:
     """Tests for save_json function."""
 
@@ -162,6 +312,49 @@ class TestSaveJson:
         os.unlink(path)
         assert "\n" in content  # Pretty printed
 
+    def test_matches_stdlib_formatting(self):
+        data = {
+            "name": "Zoë",
+            1: [datetime(2024, 1, 15, 9, 30)],
+            "records": [{"amount": float('nan'), "total": None}, {"limit": float('inf')}],
+            "floor": float('-inf'),
+        }
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            path = f.name
+        save_json(data, path)
+        with open(path, encoding='utf-8') as f:
+            content = f.read()
+        os.unlink(path)
+        assert content == json.dumps(data, indent=2, default=str, ensure_ascii=False)
+
+    def test_record_lists_match_stdlib_formatting(self):
+        data = {
+            "vendor": "Acme",
+            "records": [{"content": "line one\nline two", "tags": ["a", {}]}, [], 42],
+            "empty": [],
+            "profile": {"Name": "Zoë", "Created": datetime(2024, 1, 15)},
+        }
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            path = f.name
+        save_json(data, path)
+        with open(path, encoding='utf-8') as f:
+            content = f.read()
+        os.unlink(path)
+        assert content == json.dumps(data, indent=2, default=str, ensure_ascii=False)
+
+
+class TestRunConcurrently:
+    """Tests for run_concurrently function."""
+
+    def test_returns_results_in_order(self):
+        assert run_concurrently(lambda: 1, lambda: 2, lambda: 3) == [1, 2, 3]
+
+    def test_reraises_task_errors(self):
+        def fail():
+            raise OSError("disk full")
+        with pytest.raises(OSError):
+            run_concurrently(lambda: 1, fail)
+
 
 class TestLoadCsv:
     """Tests for load_csv function."""
@@ -186,6 +379,33 @@ class TestLoadCsv:
         assert result == []
 
 
+class TestIterCsvRows:
+    """Tests for iter_csv_rows function."""
+
+    def test_yields_header_then_rows_skipping_blank_lines(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, newline='') as f:
+            f.write("name,email\nJohn,john@test.com\n\nJane,jane@test.com\n")
+        result = list(iter_csv_rows(f.name))
+        os.unlink(f.name)
+        assert result == [['name', 'email'], ['John', 'john@test.com'], ['Jane', 'jane@test.com']]
+
+    def test_handles_empty_csv(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            f.write("")
+        result = list(iter_csv_rows(f.name))
+        os.unlink(f.name)
+        assert result == []
+
+    def test_detects_non_utf8_encoding(self):
+        with tempfile.NamedTemporaryFile(mode='wb', suffix='.csv', delete=False) as f:
+            f.write("name\nJosé\n".encode('latin-1'))
+        encoding = detect_csv_encoding(f.name)
+        result = list(iter_csv_rows(f.name))
+        os.unlink(f.name)
+        assert encoding == 'latin-1'
+        assert result[1] == ['José']
+
+
 class TestEnsureOutputDir:
     """Tests for ensure_output_dir function."""
 
@@ -237,6 +457,17 @@ class TestValidateDataSubjectMatch:
             validate_data_subject_match(matches, "John Smith", "different@test.com")
 
 
+class TestFindNameMatches:
+    """Tests for find_name_matches function."""
+
+    def test_matches_substrings_both_ways(self):
+        candidates = ["John Smith", "john", "John Smithson", "Jane Doe", None, ""]
+        assert find_name_matches("John Smith", candidates) == [0, 1, 2]
+
+    def test_empty_name_matches_nothing(self):
+        assert find_name_matches("", ["John Smith"]) == []
+
+
 class TestAmbiguousMatchError:
     """Tests for AmbiguousMatchError exception."""
 